@@ -0,0 +1,112 @@
+import argparse
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Union
+
+import numpy as np
+import pandas as pd
+
+from main import PARAMS
+from src.model import SimulationModel
+
+
+def expand_parameters(parameters: Union[Dict[str, list], List[dict]]) -> List[dict]:
+    """
+    Turns a parameter grid (name -> list of values) into the list of all its combinations.
+    A list of parameter sets is returned unchanged.
+    """
+    if isinstance(parameters, list):
+        return [dict(sample) for sample in parameters]
+
+    names = list(parameters)
+    return [dict(zip(names, values)) for values in itertools.product(*(parameters[name] for name in names))]
+
+
+def run_simulation(run: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Runs one simulation and returns its population time series.
+    """
+    model = SimulationModel(**run["params"], metrics_path=run["metrics_path"], seed=run["seed"])
+    model.run_model()
+
+    results = model.datacollector.get_model_vars_dataframe()
+    results.insert(0, "Step", results.index)
+    results.insert(0, "seed", run["seed"])
+    for name, value in reversed(run["varied"].items()):
+        results.insert(0, name, value)
+    results.insert(0, "RunId", run["run_id"])
+
+    return results
+
+
+def batch_run(
+    parameters: Union[Dict[str, list], List[dict]],
+    iterations: int = None,
+    repetitions: int = 1,
+    seed: int = None,
+    processes: int = None,
+    output_dir: str = "runs",
+    output_format: str = "csv",
+    base_params: Dict[str, Any] = PARAMS
+) -> pd.DataFrame:
+    """
+    Runs the model for every parameter set (repeated `repetitions` times) on a process pool.
+
+    Every run gets its own seed and writes its own metrics file to output_dir. The population time series
+    of all runs are merged into one table with the run id, varied parameters, seed and step in front of
+    the DataCollector columns.
+    """
+    samples = expand_parameters(parameters)
+    seeds = np.random.SeedSequence(seed).generate_state(len(samples) * repetitions).tolist()
+    os.makedirs(output_dir, exist_ok=True)
+
+    runs = []
+    for run_id, (sample, run_seed) in enumerate(zip(itertools.chain.from_iterable(
+            itertools.repeat(sample, repetitions) for sample in samples), seeds)):
+        params = {**base_params, **sample}
+        if iterations is not None:
+            params["iterations"] = iterations
+        runs.append({
+            "run_id": run_id,
+            "params": params,
+            "varied": sample,
+            "seed": run_seed,
+            "metrics_path": os.path.join(output_dir, f"run_{run_id:04d}.{output_format}"),
+        })
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        results = list(executor.map(run_simulation, runs))
+
+    return pd.concat(results, ignore_index=True)
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run a parameter sweep of the simulation in parallel.")
+    parser.add_argument("parameters", help="JSON file with a parameter grid (name -> list of values) or a list of parameter sets")
+    parser.add_argument("-i", "--iterations", type=int, help="number of steps of every run")
+    parser.add_argument("-r", "--repetitions", type=int, default=1, help="number of runs of every parameter set")
+    parser.add_argument("-s", "--seed", type=int, help="seed from which the seeds of the runs are derived")
+    parser.add_argument("-p", "--processes", type=int, help="number of worker processes")
+    parser.add_argument("-d", "--output-dir", default="runs", help="directory for the metrics files of the runs")
+    parser.add_argument("-f", "--format", choices=("csv", "wsm"), default="csv", help="format of the metrics files")
+    parser.add_argument("-o", "--output", default="results.csv", help="file for the merged results")
+    args = parser.parse_args(argv)
+
+    with open(args.parameters) as f:
+        parameters = json.load(f)
+
+    results = batch_run(
+        parameters,
+        iterations=args.iterations,
+        repetitions=args.repetitions,
+        seed=args.seed,
+        processes=args.processes,
+        output_dir=args.output_dir,
+        output_format=args.format,
+    )
+    results.to_csv(args.output, index=False)
+
+if __name__ == "__main__":
+    main()
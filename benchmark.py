@@ -0,0 +1,118 @@
+import argparse
+import json
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List
+
+from main import PARAMS
+from src.model import SimulationModel
+
+# Initial populations are scaled with the area of the grid, 200x200 matches main.py.
+SCENARIOS = {
+    "100": {"width": 100, "height": 100, "initial_plant": 1750,
+            "initial_number_of_hares_habitats": 4, "initial_number_of_foxes_habitats": 1},
+    "200": {"width": 200, "height": 200, "initial_plant": 7000,
+            "initial_number_of_hares_habitats": 14, "initial_number_of_foxes_habitats": 4},
+    "400": {"width": 400, "height": 400, "initial_plant": 28000,
+            "initial_number_of_hares_habitats": 56, "initial_number_of_foxes_habitats": 8},
+    "800": {"width": 800, "height": 800, "initial_plant": 112000,
+            "initial_number_of_hares_habitats": 224, "initial_number_of_foxes_habitats": 16},
+}
+
+
+def run_scenario(name: str, steps: int, seed: int) -> Dict[str, Any]:
+    """
+    Builds the scenario model and measures its step rate, then its per-class and per-phase step cost
+    on a second, profiled model.
+    Runs in its own process so the peak memory belongs to the scenario.
+    """
+    params = {**PARAMS, **SCENARIOS[name], "iterations": steps, "metrics_path": None, "seed": seed}
+
+    start = time.perf_counter()
+    model = SimulationModel(**params)
+    setup_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    model.run_model()
+    run_time = time.perf_counter() - start
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    model = SimulationModel(**params, profile=True)
+    model.run_model()
+    summary = model.profiler.summary()
+
+    return {
+        "width": params["width"],
+        "height": params["height"],
+        "steps": steps,
+        "setup_seconds": setup_time,
+        "steps_per_second": steps / run_time,
+        "peak_memory_mb": peak_memory,
+        "agents": model.scheduler.get_agent_count(),
+        "step_cost": {
+            name: {"calls": int(row.Calls), "seconds": float(row.Seconds), "us_per_call": float(row.us_per_call)}
+            for name, row in summary.iterrows()
+        },
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Returns descriptions of the scenarios which are slower or use more memory than the baseline.
+    """
+    regressions = []
+    for name, result in results["scenarios"].items():
+        base = baseline["scenarios"].get(name)
+        if base is None or base["steps"] != result["steps"]:
+            continue
+        if result["steps_per_second"] < base["steps_per_second"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {result['steps_per_second']:.2f} steps/s, baseline {base['steps_per_second']:.2f} steps/s"
+            )
+        if result["peak_memory_mb"] > base["peak_memory_mb"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: {result['peak_memory_mb']:.1f} MB peak, baseline {base['peak_memory_mb']:.1f} MB peak"
+            )
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the simulation at several grid sizes.")
+    parser.add_argument("-s", "--sizes", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS), help="scenarios to run")
+    parser.add_argument("-n", "--steps", type=int, default=100, help="number of steps of every scenario")
+    parser.add_argument("--seed", type=int, default=0, help="seed of every scenario")
+    parser.add_argument("-o", "--output", default="benchmark.json", help="file for the results")
+    parser.add_argument("-b", "--baseline", help="results file to compare against")
+    parser.add_argument("-t", "--tolerance", type=float, default=0.1, help="allowed relative slowdown or memory growth")
+    args = parser.parse_args(argv)
+
+    results = {"python": sys.version.split()[0], "platform": platform.platform(), "scenarios": {}}
+    for name in args.sizes:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            result = executor.submit(run_scenario, name, args.steps, args.seed).result()
+        results["scenarios"][name] = result
+        print(
+            f"{name:>5}: {result['steps_per_second']:8.2f} steps/s {result['peak_memory_mb']:8.1f} MB peak "
+            f"{result['setup_seconds']:6.2f} s setup"
+        )
+        for cls, cost in result["step_cost"].items():
+            print(f"{'':>7}{cls:<40} {cost['calls']:>9} calls {cost['us_per_call']:10.1f} us/call")
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        return 1 if regressions else 0
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
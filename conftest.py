@@ -0,0 +1,22 @@
+from typing import Any, Callable
+
+import pytest
+
+from main import PARAMS
+from src.model import SimulationModel
+
+# Small map with one habitat of each kind, so a model is built and stepped quickly in tests.
+SMALL_PARAMS = {
+    **PARAMS, "width": 50, "height": 50, "initial_plant": 100, "initial_number_of_hares_habitats": 1,
+    "initial_number_of_foxes_habitats": 1, "metrics_path": None, "seed": 0
+}
+
+
+@pytest.fixture
+def make_model() -> Callable[..., SimulationModel]:
+    """
+    Returns a factory of small models, keyword arguments override SMALL_PARAMS.
+    """
+    def make(**params: Any) -> SimulationModel:
+        return SimulationModel(**{**SMALL_PARAMS, **params})
+    return make
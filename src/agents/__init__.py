@@ -1,6 +1,4 @@
 from .fox import Fox
 from .hare import Hare
-from .pheromone import Pheromone
-from .sound import Sound
 
-__all__ = ['Fox', 'Hare', 'Pheromone', 'Sound']
+__all__ = ['Fox', 'Hare']
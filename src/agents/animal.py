@@ -1,10 +1,13 @@
 from abc import ABC, abstractmethod
-from numpy import arctan2, degrees
-from random import choice
+from numpy import ndarray
 from enum import IntEnum
-from typing import Tuple
+from typing import List, Tuple
 import mesa
 
+from .perception import Perception
+from ..environment.space import class_of
+from .vision import view_cone
+
 class ViewDirection(IntEnum):
     TOP = 90
     RIGHT = 0
@@ -31,6 +34,8 @@ class ViewDirection(IntEnum):
 
 class Animal(mesa.Agent, ABC):
     """Animal interface"""
+    _perception = None
+    _perception_key = None
 
     def __init__(
         self,
@@ -49,7 +54,7 @@ class Animal(mesa.Agent, ABC):
         self.trace = trace
         self.view_range = view_range
         self.view_angle = view_angle
-        self.view_direction = choice(list(ViewDirection))
+        self.view_direction = self.random.choice(list(ViewDirection))
         self.eaten = 0
         self.is_alive = True
 
@@ -71,35 +76,53 @@ class Animal(mesa.Agent, ABC):
         self.model.scheduler.remove(self)
         self.is_alive = False
 
-    def get_neighbors_within_angle(self):
-        neighbors = []
-        possible_neighbors = self.model.grid.get_neighbors(
-            self.pos,
-            moore=True,
-            include_center=False,
-            radius=self.view_range
-        )
-        for agent in possible_neighbors:
-            if agent.unique_id != self.unique_id:
-                dx = agent.pos[0] - self.pos[0]
-                dy = agent.pos[1] - self.pos[1]
-
-                # Calculate angle between current agent and the potential neighbor
+    def view_cone(self, view_range: int = None) -> ndarray:
+        """
+        Returns mask of the cells within the view angle, see vision.view_cone.
+        """
+        view_range = self.view_range if view_range is None else view_range
+        return view_cone(int(self.view_direction), view_range, self.view_angle)
 
-                angle_to_agent = arctan2(dy, dx)
-                angle_to_agent = degrees(angle_to_agent) % 360
+    def perceive(self) -> Perception:
+        """
+        Returns the perception of the animal in the current step.
+        It is computed once and recomputed when the animal moves or turns.
+        """
+        key = (self.model.scheduler.steps, self.pos, self.view_direction)
+        if self._perception_key != key:
+            self._perception = Perception(self)
+            self._perception_key = key
+        return self._perception
 
-                # Calculate the angle difference (absolute value)
-                angle_diff = abs((angle_to_agent - int(self.view_direction) + 180) % 360 - 180)
+    def get_neighbors_within_angle(self, agent_type: type, view_range: int = None) -> List[mesa.Agent]:
+        """
+        Returns agents of the given class which are within the view range and angle.
+        Ranges up to the view range are answered from the perception of the current step.
+        """
+        if view_range is None or view_range <= self.view_range:
+            return self.perceive().seen(agent_type, view_range)
+        return self.look(agent_type, view_range)
 
-                # If the angle difference is within the desired view angle, consider it a neighbor
-                if angle_diff <= self.view_angle // 2:
-                    neighbors.append(agent)
+    def look(self, agent_type: type, view_range: int = None) -> List[mesa.Agent]:
+        """
+        Queries the grid for agents of the given class which are within the view range and angle.
+        """
+        view_range = self.view_range if view_range is None else view_range
+        cone = self.view_cone(view_range)
+        x, y = self.pos
+        possible_neighbors = self.model.grid.get_neighbors_of_type(self.pos, agent_type, radius=view_range)
 
-        return neighbors
+        return [
+            agent for agent in possible_neighbors
+            if cone[agent.pos[0] - x + view_range, agent.pos[1] - y + view_range]
+        ]
 
     def sees(self, agent: 'Animal') -> bool:
-        return agent in self.get_neighbors_within_angle()
+        # Asked by other animals while they move, so the perception cannot be used.
+        seen = self.model.visibility.lookup(self, agent)
+        if seen is not None:
+            return seen
+        return agent in self.look(class_of(agent))
 
     def random_move(self, distance: int = 1) -> None:
         """
@@ -1,14 +1,11 @@
 import importlib
 from enum import Enum
 from typing import Tuple, List
-from random import choice
 
 import mesa
 import numpy as np
 
 from .animal import Animal, ViewDirection
-from .sound import Sound, Direction
-from .pheromone import Pheromone
 from .fox_habitat import FoxHabitat
 from .vaccine_factory import Vaccine
 
@@ -20,6 +17,7 @@ class State(Enum):
 
 
 class Fox(Animal):
+    PROFILED_PHASES = ("hunt", "make_noise", "smell", "get_vaccine", "get_hares_in_attack_range", "get_hares_in_sneaking_range")
 
     def __init__(self,
                  model,
@@ -59,19 +57,11 @@ class Fox(Animal):
         model.grid.place_agent(fox, home.pos)
         model.scheduler.add(fox)
 
-    def smell(self) -> dict:
+    def smell(self) -> Tuple[int, int] | None:
         """
-        Smell the pheromone in the smelling range.
+        Smell the pheromone in the smelling range and return the position of the strongest one.
         """
-        neighbors = self.model.grid.get_neighbors(
-            self.pos,
-            moore=True,
-            include_center=False,
-            radius=self.smelling_range
-        )
-        smell = {neighbor.pos: neighbor.value for neighbor in neighbors if type(neighbor) is Pheromone}
-
-        return smell
+        return self.model.pheromones.strongest(self.pos, self.smelling_range)
 
     def kill(self) -> None:
         """
@@ -154,11 +144,7 @@ class Fox(Animal):
         Returns hares that are seen in the fox attack range.
         """
         hare = importlib.import_module("src.agents.hare")
-        view_range = self.view_range
-        self.view_range = self.attack_range
-        neighbors = self.get_neighbors_within_angle()
-        self.view_range = view_range
-        hares = [neighbor for neighbor in neighbors if type(neighbor) is hare.Hare]
+        hares = self.get_neighbors_within_angle(hare.Hare, self.attack_range)
 
         return hares
 
@@ -167,9 +153,9 @@ class Fox(Animal):
         Returns hares that are seen in the fox view range.
         """
         hare = importlib.import_module("src.agents.hare")
-        hares_in_attack_range = self.get_hares_in_attack_range()
-        neighbors = self.get_neighbors_within_angle()
-        hares = [neighbor for neighbor in neighbors if type(neighbor) is hare.Hare and neighbor not in hares_in_attack_range]
+        hares_in_attack_range = set(self.get_hares_in_attack_range())
+        neighbors = self.get_neighbors_within_angle(hare.Hare)
+        hares = [neighbor for neighbor in neighbors if neighbor not in hares_in_attack_range]
 
         return hares
 
@@ -177,8 +163,7 @@ class Fox(Animal):
         """
         Returns vaccine closest to fox.
         """
-        neighbors = self.get_neighbors_within_angle()
-        vaccines = [neighbor for neighbor in neighbors if type(neighbor) is Vaccine]
+        vaccines = self.get_neighbors_within_angle(Vaccine)
 
         vaccine = None
         if vaccines:
@@ -231,18 +216,17 @@ class Fox(Animal):
             hares_to_attack = self.get_hares_in_attack_range()
             hares_to_sneak = self.get_hares_in_sneaking_range()
             if hares_to_attack:
-                self.focused_hare = choice(hares_to_attack)
+                self.focused_hare = self.random.choice(hares_to_attack)
                 self.attack()
                 return
 
             if hares_to_sneak:
-                self.focused_hare = choice(hares_to_sneak)
+                self.focused_hare = self.random.choice(hares_to_sneak)
                 self.sneak()
                 return
 
-        smell = self.smell()
-        if smell:
-            heuristic = max(smell, key=smell.get)
+        heuristic = self.smell()
+        if heuristic:
             self.go_in_direction(heuristic)
 
         else:
@@ -261,10 +245,7 @@ class Fox(Animal):
             case _:
                 pass
 
-        for ngh in self.model.grid.get_neighborhood(self.pos, moore=True):
-            dx = (ngh[0] > self.pos[0]) - (ngh[0] < self.pos[0])
-            dy = (ngh[1] < self.pos[1]) - (ngh[1] > self.pos[1])
-            Sound.create_sound(self.model, ngh, 1, Direction.get((dx, dy)), True, force)
+        self.model.sounds.emit(self.pos, force)
 
     def hungry(self) -> bool:
         """
@@ -1,6 +1,5 @@
-from typing import Dict, Tuple
+from typing import Tuple
 import mesa
-import numpy as np
 from importlib import import_module
 
 class FoxHabitat(mesa.Agent):
@@ -10,11 +9,11 @@ class FoxHabitat(mesa.Agent):
     """
     def __init__(self, model: mesa.Model, mating_season:int = 365, mating_range: Tuple[int, int] = (1,11),storage:int = 0) -> None:
         super().__init__(model.next_id(), model)
-        self.mating_season = mating_season
         self.model = model
         self.mating_range = mating_range
         self.initial_mating_season = mating_season
         self.storage = storage
+        model.timers.schedule(model.scheduler.first_step + mating_season, self, "mate")
 
     def create_animals(self) -> None:
         """
@@ -29,29 +28,22 @@ class FoxHabitat(mesa.Agent):
         habitat = FoxHabitat(model, **model.fox_habitat_params)
         # print(habitat.mating_season)
         # print(habitat.mating_range)
-        possible_positions = np.where(model.map == 1)
-        random_index = np.random.choice(len(possible_positions[0]), 1, replace=False)
-        x = int(possible_positions[0][random_index])
-        y = int(possible_positions[1][random_index])
-        model.grid.place_agent(habitat, (y, model.height - 1 - x))
+        xs, ys = model.sample_cells(model.forest_cells, 1, model.habitat_rng)
+        model.grid.place_agent(habitat, (int(xs[0]), int(ys[0])))
         model.scheduler.add(habitat)
         if create:
             habitat.create_animals()
         return habitat
        
             
-    def step(self) -> None:
+    def mate(self) -> None:
         """
-        Method called in every step of the simulation.
-        It creates few foxes in the habitat every mating season.
+        Method called by the timer every mating season.
+        It creates few foxes in the habitat and schedules the next mating season.
         """
         fox = import_module("src.agents.fox")
-        if self.mating_season == 0:
-            self.mating_season = self.initial_mating_season
-            self.model.num_of_foxes += 1
-            number_of_foxes_to_create = np.random.randint(self.mating_range[0], self.mating_range[1])
-            for _ in range(number_of_foxes_to_create):
-                fox.Fox.create(self.model, self, False)
-        else:
-            self.mating_season -= 1
-
+        self.model.num_of_foxes += 1
+        number_of_foxes_to_create = self.model.habitat_rng.integers(self.mating_range[0], self.mating_range[1])
+        for _ in range(number_of_foxes_to_create):
+            fox.Fox.create(self.model, self, False)
+        self.model.timers.schedule(self.model.scheduler.steps + self.initial_mating_season + 1, self, "mate")
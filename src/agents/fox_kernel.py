@@ -0,0 +1,235 @@
+from typing import Dict, List, NamedTuple, Tuple
+import mesa
+import numpy as np
+
+from .animal import ViewDirection
+from .fox import Fox, State
+from .hare import Hare
+from .vaccine_factory import Vaccine
+from .vision import view_cone
+
+# Thresholds of the direction components used by Fox.go_in_direction.
+SIN = np.sin(22.5 / 180)
+COS = np.cos(67.5 / 180)
+
+
+class Move(NamedTuple):
+    """
+    Steps of the foxes towards their targets, see Fox.go_in_direction.
+    """
+    dx: np.ndarray
+    dy: np.ndarray
+    dir_x: np.ndarray
+    dir_y: np.ndarray
+
+
+class FoxKernel:
+    """
+    Batched update of the foxes.
+
+    At the start of the fox stage the perception of all foxes is evaluated at once with fox x hare and
+    fox x vaccine distance matrices: vaccines and hares seen in the view cones, the hares to attack or
+    sneak on, whether focused hares see their foxes, and the moves towards all of these targets.
+    Foxes only move themselves and hares do not move in the fox stage, so this equals what every fox
+    perceives at its turn. The decisions of Fox.hunt are then applied fox by fox; a fox whose chosen
+    hare or vaccine was taken by an earlier fox in the same step hunts with Fox.hunt. Foxes without
+    a target follow the scent with Fox.smell, see PheromoneField.strongest.
+    """
+
+    def __init__(self, model: mesa.Model) -> None:
+        self.model = model
+        self._cones: Dict[Tuple[int, int], np.ndarray] = {}
+
+    def cones(self, view_range: int, view_angle: int) -> np.ndarray:
+        """
+        Returns the view cones of all view directions, indexed by [direction % 360 // 45, dx + r, dy + r].
+        """
+        cones = self._cones.get((view_range, view_angle))
+        if cones is None:
+            cones = np.zeros((8, 2 * view_range + 1, 2 * view_range + 1), dtype=bool)
+            for direction in ViewDirection:
+                cones[direction % 360 // 45] = view_cone(int(direction), view_range, view_angle)
+            self._cones[(view_range, view_angle)] = cones
+        return cones
+
+    def in_cone(
+        self, dx: np.ndarray, dy: np.ndarray, directions: np.ndarray, view_range: int, view_angle: int
+    ) -> np.ndarray:
+        """
+        Returns whether the offsets (dx, dy) are within the view range and cone of observers looking in the directions.
+        """
+        r = view_range
+        near = (np.abs(dx) <= r) & (np.abs(dy) <= r) & ((dx != 0) | (dy != 0))
+        cones = self.cones(r, view_angle)
+        return near & cones[directions % 360 // 45, np.clip(dx + r, 0, 2 * r), np.clip(dy + r, 0, 2 * r)]
+
+    def seen(
+        self, xs: np.ndarray, ys: np.ndarray, directions: np.ndarray, targets: np.ndarray, view_range: int, view_angle: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the mask of the targets seen by every observer, with the offsets (dx, dy) from the observers to the targets.
+        """
+        dx = targets[:, 0] - xs[:, None]
+        dy = targets[:, 1] - ys[:, None]
+        return self.in_cone(dx, dy, directions[:, None], view_range, view_angle), dx, dy
+
+    def pick(self, candidates: np.ndarray) -> np.ndarray:
+        """
+        Returns the index of a random candidate of every row, -1 for rows without candidates.
+        """
+        keys = np.where(candidates, self.model.fox_rng.random(candidates.shape), 2)
+        choice = keys.argmin(axis=1) if candidates.shape[1] else np.zeros(len(candidates), dtype=int)
+        return np.where(candidates.any(axis=1), choice, -1)
+
+    @staticmethod
+    def moves(xs: np.ndarray, ys: np.ndarray, tx: np.ndarray, ty: np.ndarray, speed: np.ndarray) -> Move:
+        """
+        Returns the steps of the foxes at (xs, ys) towards (tx, ty) with the given speeds, see Fox.go_in_direction.
+        """
+        dx = tx - xs
+        dy = ty - ys
+        with np.errstate(invalid="ignore"):
+            norm = np.hypot(dx, dy)
+            ux = dx / norm
+            uy = dy / norm
+
+        up = uy > SIN
+        down = uy < -SIN
+        right = ux > COS
+        left = ux < -COS
+        step_y = np.where(up, np.minimum(dy, speed), np.where(down, np.maximum(dy, -speed), 0))
+        step_x = np.where(right, np.minimum(dx, speed), np.where(left, np.maximum(dx, -speed), 0))
+        return Move(step_x, step_y, right.astype(int) - left, down.astype(int) - up)
+
+    def go(self, fox: Fox, move: Move, i: int) -> None:
+        """
+        Applies the i-th step of the move to the fox, see Fox.go_in_direction.
+        """
+        x, y = fox.pos
+        self.model.grid.move_agent(fox, (x + int(move.dx[i]), y + int(move.dy[i])))
+        dir_x, dir_y = int(move.dir_x[i]), int(move.dir_y[i])
+        if dir_x != 0 or dir_y != 0:
+            fox.view_direction = ViewDirection.get((dir_x, dir_y))
+        fox.kill()
+
+    def step_all(self, model: mesa.Model, foxes: List[Fox]) -> None:
+        """
+        Steps all given foxes, see Fox.step.
+        """
+        params = model.fox_params
+        view_range = params["view_range"]
+        attack_range = params["attack_range"]
+
+        # Only the adult foxes which hunt look around.
+        hunters = [fox for fox in foxes if fox.adult and fox.hunting]
+        rows = {fox.unique_id: i for i, fox in enumerate(hunters)}
+        n = len(hunters)
+
+        pos = np.array([fox.pos for fox in hunters], dtype=np.int64).reshape(-1, 2)
+        xs, ys = pos[:, 0], pos[:, 1]
+        directions = np.array([int(fox.view_direction) for fox in hunters], dtype=np.int64)
+        walking_speed = np.array([
+            params["sprint_speed"] if fox.state == State.SPRINTING
+            else params["sneak_speed"] if fox.state == State.SNEAKING
+            else params["speed"]
+            for fox in hunters
+        ], dtype=np.int64)
+
+        # Closest vaccine in the view cone by the taxicab distance.
+        vaccines = model.grid.get_agents_of_type(Vaccine)
+        vaccine_choice = np.full(n, -1)
+        vaccine_move = None
+        if vaccines:
+            targets = np.array([vaccine.pos for vaccine in vaccines], dtype=np.int64)
+            seen, dx, dy = self.seen(xs, ys, directions, targets, view_range, params["view_angle"])
+            distances = np.where(seen, np.abs(dx) + np.abs(dy), np.iinfo(np.int64).max)
+            vaccine_choice = np.where(seen.any(axis=1), distances.argmin(axis=1), -1)
+            chosen = targets[np.maximum(vaccine_choice, 0)]
+            vaccine_move = self.moves(xs, ys, chosen[:, 0], chosen[:, 1], walking_speed)
+
+        # Hares in the attack range and hares only in the sneaking range of the view cone.
+        if model.hare_kernel:
+            hares = list(model.hare_kernel.hares)
+            hare_pos = model.hare_kernel.pos[:len(hares)]
+        else:
+            hares = model.grid.get_agents_of_type(Hare)
+            hare_pos = np.array([hare.pos for hare in hares], dtype=np.int64).reshape(-1, 2)
+        seen, dx, dy = self.seen(xs, ys, directions, hare_pos, view_range, params["view_angle"])
+        in_attack_range = seen & (np.maximum(np.abs(dx), np.abs(dy)) <= attack_range)
+        to_attack = self.pick(in_attack_range)
+        to_sneak = self.pick(seen & ~in_attack_range)
+        chosen = hare_pos[np.maximum(to_attack, 0)] if hares else pos
+        attack_move = self.moves(xs, ys, chosen[:, 0], chosen[:, 1], params["sprint_speed"])
+        chosen = hare_pos[np.maximum(to_sneak, 0)] if hares else pos
+        sneak_move = self.moves(xs, ys, chosen[:, 0], chosen[:, 1], params["sneak_speed"])
+
+        # Focused hares, their distance and whether they see their fox.
+        focused = [fox.focused_hare if fox.focused_hare and fox.focused_hare.is_alive else None for fox in hunters]
+        focused_pos = np.array([hare.pos if hare else fox.pos for hare, fox in zip(focused, hunters)], dtype=np.int64)
+        focused_pos = focused_pos.reshape(-1, 2)
+        focused_dist = np.maximum(np.abs(focused_pos[:, 0] - xs), np.abs(focused_pos[:, 1] - ys))
+        focused_speed = np.where(focused_dist <= attack_range, params["sprint_speed"], params["sneak_speed"])
+        focus_move = self.moves(xs, ys, focused_pos[:, 0], focused_pos[:, 1], focused_speed)
+        hare_directions = np.array([int(hare.view_direction) if hare else 0 for hare in focused], dtype=np.int64)
+        spotted = self.in_cone(
+            xs - focused_pos[:, 0], ys - focused_pos[:, 1], hare_directions,
+            model.hare_params["view_range"], model.hare_params["view_angle"]
+        )
+
+        for fox in foxes:
+            if fox.should_die():
+                continue
+            if not fox.adult:
+                fox.baby_step()
+                continue
+            if not fox.hunting:
+                fox.return_to_home()
+                fox.make_noise()
+                continue
+            i = rows.get(fox.unique_id)
+            if i is None:
+                # Grown up in this step.
+                fox.hunt()
+                fox.make_noise()
+                continue
+
+            hare = focused[i]
+            if hare is not None and hare.is_alive:
+                if focused_dist[i] <= view_range:
+                    if focused_dist[i] <= attack_range:
+                        fox.state = State.SPRINTING
+                        self.go(fox, focus_move, i)
+                    else:
+                        fox.state = State.SNEAKING
+                        if not spotted[i]:
+                            self.go(fox, focus_move, i)
+                    fox.make_noise()
+                    continue
+                fox.focused_hare = None
+            elif vaccine_choice[i] >= 0 or to_attack[i] >= 0 or to_sneak[i] >= 0:
+                vaccine = vaccines[vaccine_choice[i]] if vaccine_choice[i] >= 0 else None
+                hare = hares[to_attack[i] if to_attack[i] >= 0 else to_sneak[i]] if vaccine is None else None
+                if (vaccine is not None and vaccine.pos is None) or (hare is not None and not hare.is_alive):
+                    fox.hunt()
+                elif vaccine is not None:
+                    self.go(fox, vaccine_move, i)
+                    if fox.take_vaccine(vaccine):
+                        vaccine.remove()
+                elif to_attack[i] >= 0:
+                    fox.focused_hare = hare
+                    fox.state = State.SPRINTING
+                    self.go(fox, attack_move, i)
+                else:
+                    fox.focused_hare = hare
+                    fox.state = State.SNEAKING
+                    if not hare.sees(fox):
+                        self.go(fox, sneak_move, i)
+                fox.make_noise()
+                continue
+
+            heuristic = fox.smell()
+            if heuristic:
+                fox.go_in_direction(heuristic)
+            else:
+                fox.random_move()
+            fox.make_noise()
@@ -3,13 +3,12 @@ from numpy import array, sqrt
 from numpy import linalg as LA
 from typing import Tuple, Union
 import mesa
+import numpy as np
 
 
 from .fox import Fox
-from .sound import Sound
-from .hare_food import HareFood
-from .pheromone import Pheromone
 from .animal import Animal, ViewDirection
+from ..environment.sound import SoundField, SoundWindow
 
 distance = lambda p1, p2: LA.norm(array(p1) - array(p2))
 def get_surrounding_points(position: Tuple[int, int], radius: int = 1):
@@ -32,6 +31,8 @@ class HareStatus(Enum):
     NO_MOVEMENT = 2
 
 class Hare(Animal):
+    PROFILED_PHASES = ("check_threats", "find_food", "listen", "random_movement", "move", "eat_food", "leave_trace")
+
     def __init__(self,
         model,
         lifetime=200,
@@ -62,6 +63,9 @@ class Hare(Animal):
 
     @staticmethod
     def create(model: mesa.Model, pos: Tuple[int, int]) -> None:
+        if model.hare_kernel:
+            model.hare_kernel.create(pos)
+            return
         hare = Hare(model, **model.hare_params)
         model.grid.place_agent(hare, pos)
         model.scheduler.add(hare)
@@ -70,53 +74,50 @@ class Hare(Animal):
         """
         Leave a trace of pheromone.
         """
-        neighbors = self.model.grid[self.pos]
-        neighbors = [neighbor for neighbor in neighbors if type(neighbor) is Pheromone]
-
-        if len(neighbors) == 0:
-            Pheromone.create(self.model, self.pos, self.trace)
-        else:
-            pheromone = neighbors[0]
-            pheromone.value = self.trace
+        self.model.pheromones[self.pos] = self.trace
 
-    def listen(self) -> dict:
+    def listen(self) -> SoundWindow:
         """
         Listen to the sound in the hearing range.
         """
-        neighbors = self.model.grid.get_neighbors(
-            self.pos,
-            moore=True,
-            include_center=False,
-            radius=self.hearing_range
-        )
-        sound = {neighbor.pos: neighbor.force for neighbor in neighbors if type(neighbor) is Sound}
-
-        return sound
+        perception = self.perceive()
+        if perception.sound is None:
+            perception.sound = self.model.sounds.listen(self.pos, self.hearing_range)
+        return perception.sound
 
     def find_food(self) -> Union[Tuple[int, int], None]:
         """
         Find food in the view range.
         """
-        neighbors = self.get_neighbors_within_angle()
-        sound = self.listen()
-        food = [neighbor.pos for neighbor in neighbors if type(neighbor) is HareFood and not neighbor.eaten]
-
-        if not food:
+        if self.model.food.nearest(self.pos) > self.view_range:
+            return None
+        xs, ys = self.model.food.positions(self.pos, self.view_cone())
+        if not len(xs):
             return None
         r = self.random_movement()
-        food.append(r)
-
-        min_distance = float('inf')
-        closest_food_pos = None
-
-        for f in food:
-            dist = distance(f, self.pos) + sum([sound.get(pos, 0) for pos in get_surrounding_points(f)]) * Sound.FORCE
-            if r == f:
-                dist += self.speed * sqrt(2)
-            if dist < min_distance:
-                min_distance = dist
-                closest_food_pos = f
-        return closest_food_pos
+        xs = np.append(xs, r[0])
+        ys = np.append(ys, r[1])
+
+        dx = xs - self.pos[0]
+        dy = ys - self.pos[1]
+        dist = np.sqrt(dx * dx + dy * dy) + self.noise(xs, ys) * SoundField.FORCE
+        dist[(xs == r[0]) & (ys == r[1])] += self.speed * sqrt(2)
+        best = int(dist.argmin())
+        return int(xs[best]), int(ys[best])
+
+    def noise(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """
+        Returns the sound heard on the 3x3 squares around the given cells.
+        """
+        d = np.maximum(np.abs(xs - self.pos[0]), np.abs(ys - self.pos[1]))
+        # The danger map holds the squares which are heard whole and do not contain the hare.
+        heard = (d > 1) & (d < self.hearing_range)
+        noise = np.where(heard, self.model.sounds.danger()[xs, ys], 0)
+        if not heard.all():
+            sound = self.listen()
+            for i in np.flatnonzero(~heard).tolist():
+                noise[i] = sum([sound.get(pos, 0) for pos in get_surrounding_points((xs[i], ys[i]))])
+        return noise
 
     def move(self, destination: Tuple[int, int]) -> None:
         """
@@ -141,12 +142,7 @@ class Hare(Animal):
         """
         Eat food.
         """
-        neighbors = self.model.grid[self.pos]
-        neighbors = [neighbor for neighbor in neighbors if type(neighbor) is HareFood and not neighbor.eaten]
-
-        if len(neighbors) > 0:
-            food = neighbors[0]
-            food.eat_food()
+        if self.model.food.eat(self.pos):
             self.eaten += 1
         else:
             # print('no food')
@@ -167,8 +163,8 @@ class Hare(Animal):
         """
         Check if there are any threats in the view range.
         """
-        neighbors = self.get_neighbors_within_angle()
-        threats = [distance(neighbor.pos, self.pos) for neighbor in neighbors if type(neighbor) is Fox]
+        neighbors = self.get_neighbors_within_angle(Fox)
+        threats = [distance(neighbor.pos, self.pos) for neighbor in neighbors]
 
         return 0 if len(threats) < 1 else min(threats)
 
@@ -184,11 +180,11 @@ class Hare(Animal):
             radius=current_speed
         )
 
-        # Find the next move with the least sound.
-        sound = self.listen()
-        sound_values = map(lambda x: sound.get(x, 0), next_moves)
-        min_value = min(sound_values)
-        next_moves = [move for move in next_moves if sound.get(move, 0) == min_value]
+        # Find the next move with the least sound, cells out of the hearing range are silent.
+        xs, ys = np.array(next_moves).T
+        heard = np.maximum(np.abs(xs - self.pos[0]), np.abs(ys - self.pos[1])) <= self.hearing_range
+        sound_values = np.where(heard, self.model.sounds.intensity[xs, ys], 0)
+        next_moves = [move for move, quiet in zip(next_moves, sound_values == sound_values.min()) if quiet]
         next_move = self.random.choice(next_moves)
 
         return next_move
@@ -1,6 +1,4 @@
 import mesa
-import numpy as np
-from .hare_food import HareFood
 
 
 class HareFoodFactory(mesa.Agent):
@@ -14,23 +12,18 @@ class HareFoodFactory(mesa.Agent):
         """
         super().__init__(model.next_id(), model)
         self.food_amount: int = food_amount
-        self.iteration = 0
         self.frquency = frequency
         self.model.scheduler.add(self)
         self.food_lifetime = food_lifetime
+        if frequency > 0:
+            self.model.timers.schedule(self.model.scheduler.first_step + frequency - 1, self, "drop_food")
 
-    def step(self) -> None:
+    def drop_food(self) -> None:
         """
-        Performs a single of agent.
-        Create number of food in given frequency
+        Called by the timer in given frequency.
+        Create number of food and schedule the next batch.
 
         """
-        self.iteration += 1
-        if self.iteration == self.frquency:
-            self.iteration = 0
-            for _ in range(self.food_amount):
-                possible_positions = np.where((self.model.map == 0) | (self.model.map == 2))
-                random_index = np.random.choice(len(possible_positions[0]), 1, replace=False)
-                x = int(possible_positions[0][random_index])
-                y = int(possible_positions[1][random_index])
-                HareFood.create(self.model, (y, self.model.height - 1 - x), self.food_lifetime)
+        xs, ys = self.model.sample_cells(self.model.meadow_cells, self.food_amount, self.model.food_rng)
+        self.model.food.add(xs, ys, self.food_lifetime)
+        self.model.timers.schedule(self.model.scheduler.steps + self.frquency, self, "drop_food")
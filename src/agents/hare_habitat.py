@@ -1,6 +1,5 @@
 from typing import Tuple
 import mesa
-import numpy as np
 
 from .hare import Hare
 
@@ -13,10 +12,10 @@ class HareHabitat(mesa.Agent):
     
     def __init__(self, model: mesa.Model, mating_season: int = 100, mating_range: Tuple[int,int]=(3, 5)) -> None:
         super().__init__(model.next_id(), model)
-        self.mating_season = mating_season
         self.model = model
         self.mating_range = mating_range
         self.initial_mating_season = mating_season
+        model.timers.schedule(model.scheduler.first_step + mating_season, self, "mate")
     
     def create_animals(self) -> None:
         """
@@ -26,19 +25,15 @@ class HareHabitat(mesa.Agent):
         # for _ in range(self.model.num_of_hares):
         Hare.create(self.model, self.pos)
     
-    def step(self) -> None:
+    def mate(self) -> None:
         """
         
-        Method called in every step of the simulation.
-        It creates few hares in the habitat every mating season.
+        Method called by the timer every mating season.
+        It creates few hares in the habitat and schedules the next mating season.
         
         """
-        if self.mating_season == 0:
-            self.mating_season = self.initial_mating_season
-            self.model.num_of_hares += 1
-            number_of_hares_to_create = np.random.randint(self.mating_range[0], self.mating_range[1])
-            for _ in range(number_of_hares_to_create):
-                Hare.create(self.model, self.pos)
-        else:
-            self.mating_season -= 1
-    
+        self.model.num_of_hares += 1
+        number_of_hares_to_create = self.model.habitat_rng.integers(self.mating_range[0], self.mating_range[1])
+        for _ in range(number_of_hares_to_create):
+            Hare.create(self.model, self.pos)
+        self.model.timers.schedule(self.model.scheduler.steps + self.initial_mating_season + 1, self, "mate")
@@ -0,0 +1,342 @@
+from typing import Any, Callable, Dict, List, Tuple
+import mesa
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .animal import ViewDirection
+from .fox import Fox
+from .hare import Hare, HareStatus
+from .vision import view_cone
+from ..environment.sound import SoundField
+
+NORMAL = HareStatus.NORMAL.value
+SPRINTING = HareStatus.SPRINTING.value
+NO_MOVEMENT = HareStatus.NO_MOVEMENT.value
+
+# View direction after a step of sign (dx, dy), indexed by [dx + 1, dy + 1], see ViewDirection.get.
+DIRECTIONS = np.array([[int(ViewDirection.get((dx, dy)) or 0) for dy in (-1, 0, 1)] for dx in (-1, 0, 1)])
+
+
+class KernelState:
+    """
+    Attribute of a KernelHare which lives in the arrays of its HareKernel while the hare holds a slot there,
+    and in the hare itself otherwise.
+    """
+
+    def __init__(self, load: Callable[[Any], Any] = int, store: Callable[[Any], Any] = None) -> None:
+        self.load = load
+        self.store = store
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, hare: 'KernelHare', owner: type = None) -> Any:
+        if hare is None:
+            return self
+        if hare._slot is None:
+            return hare.__dict__[self.name]
+        return self.load(getattr(hare._kernel, self.name)[hare._slot])
+
+    def __set__(self, hare: 'KernelHare', value: Any) -> None:
+        if hare._slot is None:
+            hare.__dict__[self.name] = value
+        else:
+            getattr(hare._kernel, self.name)[hare._slot] = self.store(value) if self.store else value
+
+
+class KernelHare(Hare):
+    """
+    Hare whose state attributes read and write its slot of the HareKernel arrays.
+
+    Created by HareKernel.create for models which use the kernel, so hares of other models keep plain attributes.
+    It is indexed, counted and scheduled as a Hare.
+    """
+    base_class = Hare
+
+    _kernel = None
+    _slot = None
+
+    pos = KernelState(
+        load=lambda pos: None if pos[0] < 0 else (int(pos[0]), int(pos[1])),
+        store=lambda pos: (-1, -1) if pos is None else pos
+    )
+    lifetime = KernelState()
+    eaten = KernelState()
+    status = KernelState(load=HareStatus, store=lambda status: status.value)
+    iteration = KernelState()
+    cool_down_iteration = KernelState()
+    view_direction = KernelState(load=ViewDirection)
+
+    def remove(self) -> None:
+        if self._slot is not None:
+            self._kernel.remove(self)
+        super().remove()
+
+
+class HareKernel:
+    """
+    Structure-of-arrays backend of the hares.
+
+    Every hare of the model is a KernelHare which owns a slot of the state arrays while it is alive,
+    its state attributes read and write the slot.
+    step_all evaluates the HareStatus state machine of all hares at once with array operations,
+    instead of scanning the neighbourhood once per hare.
+
+    All hares are expected to share the model's hare_params. Decisions are the ones of Hare.step,
+    but every hare decides on the food which is left after all hares have eaten in the step.
+    """
+    STATE = {
+        "pos": (np.int64, (2,)),
+        "lifetime": (np.int64, ()),
+        "eaten": (np.int64, ()),
+        "status": (np.int8, ()),
+        "iteration": (np.int64, ()),
+        "cool_down_iteration": (np.int64, ()),
+        "view_direction": (np.int64, ()),
+    }
+
+    def __init__(self, model: mesa.Model, capacity: int = 64) -> None:
+        self.model = model
+        self.hares: List[KernelHare] = []
+        for name, (dtype, shape) in HareKernel.STATE.items():
+            setattr(self, name, np.zeros((capacity,) + shape, dtype=dtype))
+        self._cones: Dict[Tuple[int, int], np.ndarray] = {}
+        self._offsets: Dict[int, np.ndarray] = {}
+
+    def create(self, pos: Tuple[int, int]) -> KernelHare:
+        """
+        Creates a hare at the position, places and schedules it, then moves it into the arrays.
+        """
+        hare = KernelHare(self.model, **self.model.hare_params)
+        self.model.grid.place_agent(hare, pos)
+        self.model.scheduler.add(hare)
+        self.add(hare)
+        return hare
+
+    def add(self, hare: KernelHare) -> None:
+        """
+        Moves the state of the hare into a free slot of the arrays.
+        """
+        slot = len(self.hares)
+        capacity = len(self.lifetime)
+        if slot == capacity:
+            for name in HareKernel.STATE:
+                array = getattr(self, name)
+                setattr(self, name, np.concatenate((array, np.zeros_like(array))))
+
+        state = {name: hare.__dict__.pop(name) for name in HareKernel.STATE}
+        self.hares.append(hare)
+        hare._kernel = self
+        hare._slot = slot
+        for name, value in state.items():
+            setattr(hare, name, value)
+
+    def remove(self, hare: KernelHare) -> None:
+        """
+        Moves the state of the hare back into the hare and fills its slot with the last one.
+        """
+        state = {name: getattr(hare, name) for name in HareKernel.STATE}
+        slot = hare._slot
+        last = self.hares.pop()
+        if last is not hare:
+            for name in HareKernel.STATE:
+                array = getattr(self, name)
+                array[slot] = array[last._slot]
+            self.hares[slot] = last
+            last._slot = slot
+
+        hare._slot = None
+        for name, value in state.items():
+            setattr(hare, name, value)
+
+    def cones(self, view_range: int, view_angle: int) -> np.ndarray:
+        """
+        Returns the view cones of all view directions, indexed by [direction % 360 // 45, dx + r, dy + r].
+        """
+        cones = self._cones.get((view_range, view_angle))
+        if cones is None:
+            cones = np.zeros((8, 2 * view_range + 1, 2 * view_range + 1), dtype=bool)
+            for direction in ViewDirection:
+                cones[direction % 360 // 45] = view_cone(int(direction), view_range, view_angle)
+            self._cones[(view_range, view_angle)] = cones
+        return cones
+
+    def offsets(self, radius: int) -> np.ndarray:
+        """
+        Returns the (dx, dy) offsets of the Moore neighbourhood of the radius, without (0, 0).
+        """
+        offsets = self._offsets.get(radius)
+        if offsets is None:
+            dx, dy = np.meshgrid(np.arange(-radius, radius + 1), np.arange(-radius, radius + 1), indexing="ij")
+            offsets = np.column_stack((dx.ravel(), dy.ravel()))
+            offsets = offsets[(offsets[:, 0] != 0) | (offsets[:, 1] != 0)]
+            self._offsets[radius] = offsets
+        return offsets
+
+    def threats(self, xs: np.ndarray, ys: np.ndarray, directions: np.ndarray) -> np.ndarray:
+        """
+        Returns the distance to the closest fox seen by every hare, 0 if it sees none, see Hare.check_threats.
+        """
+        params = self.model.hare_params
+        r = params["view_range"]
+        foxes = self.model.grid.get_agents_of_type(Fox)
+        if not foxes:
+            return np.zeros(len(xs))
+
+        fox_pos = np.array([fox.pos for fox in foxes])
+        dx = fox_pos[:, 0] - xs[:, None]
+        dy = fox_pos[:, 1] - ys[:, None]
+        near = (np.abs(dx) <= r) & (np.abs(dy) <= r) & ((dx != 0) | (dy != 0))
+        cones = self.cones(r, params["view_angle"])
+        seen = near & cones[directions[:, None] % 360 // 45, np.clip(dx + r, 0, 2 * r), np.clip(dy + r, 0, 2 * r)]
+
+        distances = np.where(seen, np.hypot(dx, dy), np.inf).min(axis=1)
+        distances[np.isinf(distances)] = 0
+        return distances
+
+    def random_movement(self, xs: np.ndarray, ys: np.ndarray, radius: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Picks for every hare one of the quietest cells within the radius, see Hare.random_movement.
+        """
+        intensity = self.model.sounds.intensity
+        width, height = intensity.shape
+        offsets = self.offsets(radius)
+        cx = xs[:, None] + offsets[:, 0]
+        cy = ys[:, None] + offsets[:, 1]
+        inside = (cx >= 0) & (cx < width) & (cy >= 0) & (cy < height)
+
+        sound = intensity[np.clip(cx, 0, width - 1), np.clip(cy, 0, height - 1)]
+        sound[:, np.abs(offsets).max(axis=1) > self.model.hare_params["hearing_range"]] = 0
+        sound[~inside] = np.inf
+        quietest = sound == sound.min(axis=1, keepdims=True)
+
+        keys = np.where(quietest, self.model.hare_rng.random(sound.shape), 2)
+        choice = keys.argmin(axis=1)
+        rows = np.arange(len(xs))
+        return cx[rows, choice], cy[rows, choice]
+
+    def find_food(
+        self, xs: np.ndarray, ys: np.ndarray, directions: np.ndarray, rx: np.ndarray, ry: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Scores the food seen by every hare and its random move (rx, ry) as in Hare.find_food.
+        Returns the best positions and a mask of the hares which see any food.
+        """
+        params = self.model.hare_params
+        r = params["view_range"]
+
+        food = np.pad(self.model.food.expiry > 0, r)
+        seen = sliding_window_view(food, (2 * r + 1, 2 * r + 1))[xs, ys]
+        seen &= self.cones(r, params["view_angle"])[directions % 360 // 45]
+        has_food = seen.reshape(len(xs), -1).any(axis=1)
+
+        # Sound summed around every cell within reach, counting only what the hare hears, see Hare.noise:
+        # cells within the hearing range without the hare's own cell.
+        reach = max(r, params["speed"])
+        w = 2 * reach + 1
+        offsets = np.arange(-reach - 1, reach + 2)
+        ox, oy = np.meshgrid(offsets, offsets, indexing="ij")
+        audible = (np.maximum(np.abs(ox), np.abs(oy)) <= params["hearing_range"]) & ((ox != 0) | (oy != 0))
+        heard = sliding_window_view(np.pad(self.model.sounds.intensity, reach + 1), (w + 2, w + 2))[xs, ys] * audible
+        sounds = 0
+        for i in range(3):
+            for j in range(3):
+                sounds = sounds + heard[:, i:i + w, j:j + w]
+
+        offsets = np.arange(-r, r + 1)
+        dx, dy = np.meshgrid(offsets, offsets, indexing="ij")
+        food_sounds = sounds[:, reach - r:reach + r + 1, reach - r:reach + r + 1]
+        scores = np.where(seen, np.hypot(dx, dy) + food_sounds * SoundField.FORCE, np.inf)
+        # Food on the random cell pays the same penalty as the random move.
+        on_random = (dx == (rx - xs)[:, None, None]) & (dy == (ry - ys)[:, None, None])
+        scores[on_random] += params["speed"] * np.sqrt(2)
+        scores = scores.reshape(len(xs), -1)
+        best = scores.argmin(axis=1)
+        best_score = scores[np.arange(len(xs)), best]
+
+        random_score = (
+            np.hypot(rx - xs, ry - ys)
+            + sounds[np.arange(len(xs)), rx - xs + reach, ry - ys + reach] * SoundField.FORCE
+            + params["speed"] * np.sqrt(2)
+        )
+        take_food = has_food & (best_score <= random_score)
+        fx = np.where(take_food, xs + best // (2 * r + 1) - r, rx)
+        fy = np.where(take_food, ys + best % (2 * r + 1) - r, ry)
+        return fx, fy, has_food
+
+    def move(self, hares: List[KernelHare], slots: np.ndarray, tx: np.ndarray, ty: np.ndarray) -> None:
+        """
+        Moves the hares towards the targets by at most their speed, see Hare.move.
+        """
+        speed = self.model.hare_params["speed"]
+        xs, ys = self.pos[slots].T
+        dx = np.clip(tx - xs, -speed, speed)
+        dy = np.clip(ty - ys, -speed, speed)
+
+        moved = (dx != 0) | (dy != 0)
+        self.view_direction[slots[moved]] = DIRECTIONS[np.sign(dx) + 1, 1 - np.sign(dy)][moved]
+
+        grid = self.model.grid
+        for i in np.flatnonzero(moved).tolist():
+            grid.move_agent(hares[i], (int(xs[i] + dx[i]), int(ys[i] + dy[i])))
+
+    def step_all(self, model: mesa.Model, hares: List[KernelHare]) -> None:
+        """
+        Steps all given hares, see Hare.step.
+        """
+        params = model.hare_params
+        slots = np.array([hare._slot for hare in hares], dtype=np.int64)
+
+        alive = self.lifetime[slots] > 0
+        if model.scheduler.steps > 0 and model.scheduler.steps % model.one_week == 0:
+            alive &= params["consumption"] <= self.eaten[slots]
+            self.eaten[slots] = 0
+        for i in np.flatnonzero(~alive).tolist():
+            hares[i].remove()
+        hares = [hare for hare, is_alive in zip(hares, alive.tolist()) if is_alive]
+        if not hares:
+            return
+        slots = np.array([hare._slot for hare in hares], dtype=np.int64)
+
+        self.lifetime[slots] -= 1
+        xs, ys = self.pos[slots].T
+        directions = self.view_direction[slots]
+        status = self.status[slots]
+        iteration = self.iteration[slots]
+        threats = self.threats(xs, ys, directions)
+
+        can_sprint = (self.cool_down_iteration[slots] == 0) & (threats < params["sprint_distance"])
+        freeze = (status == NORMAL) & (threats > params["sprint_distance"])
+        start_sprint = ((status == NORMAL) & ~freeze | (status == NO_MOVEMENT)) & can_sprint
+        forage = (status == NORMAL) & ~freeze & ~can_sprint
+        keep_sprinting = (status == SPRINTING) & (iteration < params["sprint_duration"])
+        stop_sprinting = (status == SPRINTING) & ~keep_sprinting
+        keep_still = (status == NO_MOVEMENT) & ~can_sprint & (iteration < params["no_movement_duration"])
+        wake_up = (status == NO_MOVEMENT) & ~can_sprint & ~keep_still
+
+        self.iteration[slots[freeze | start_sprint]] = 1
+        self.iteration[slots[keep_sprinting | keep_still]] += 1
+        self.status[slots[freeze]] = NO_MOVEMENT
+        self.status[slots[start_sprint]] = SPRINTING
+        self.status[slots[stop_sprinting | wake_up]] = NORMAL
+        self.cool_down_iteration[slots[stop_sprinting]] = params["sprint_cool_down"]
+
+        eats = np.flatnonzero(forage)
+        self.eaten[slots[eats]] += model.food.eat_all(xs[eats], ys[eats])
+
+        tx = xs.copy()
+        ty = ys.copy()
+        sprint = np.flatnonzero(start_sprint | keep_sprinting)
+        tx[sprint], ty[sprint] = self.random_movement(xs[sprint], ys[sprint], params["sprint_speed"])
+        walk = np.flatnonzero(stop_sprinting | wake_up | forage)
+        tx[walk], ty[walk] = self.random_movement(xs[walk], ys[walk], params["speed"])
+        if len(eats):
+            fx, fy, has_food = self.find_food(xs[eats], ys[eats], directions[eats], tx[eats], ty[eats])
+            tx[eats[has_food]] = fx[has_food]
+            ty[eats[has_food]] = fy[has_food]
+
+        moving = np.flatnonzero(start_sprint | keep_sprinting | stop_sprinting | wake_up | forage)
+        self.move([hares[i] for i in moving.tolist()], slots[moving], tx[moving], ty[moving])
+
+        xs, ys = self.pos[slots].T
+        model.pheromones.deposit(xs, ys, params["trace"])
@@ -0,0 +1,32 @@
+from typing import Dict, List, Tuple, Union
+import mesa
+
+from ..environment.sound import SoundWindow
+
+
+class Perception:
+    """
+    What an animal perceives from one position in one step: the agents of every class in its view cone,
+    with their Chebyshev distances, and the sound around it.
+
+    Parts are looked up on first use, so every class is queried at most once per perception.
+    """
+
+    def __init__(self, animal: mesa.Agent) -> None:
+        self.animal = animal
+        self.sound: Union[SoundWindow, None] = None
+        self._seen: Dict[type, List[Tuple[int, mesa.Agent]]] = {}
+
+    def seen(self, agent_type: type, distance: int = None) -> List[mesa.Agent]:
+        """
+        Returns the agents of the given class in the view cone, up to the distance if given.
+        """
+        seen = self._seen.get(agent_type)
+        if seen is None:
+            x, y = self.animal.pos
+            seen = self._seen[agent_type] = [
+                (max(abs(agent.pos[0] - x), abs(agent.pos[1] - y)), agent) for agent in self.animal.look(agent_type)
+            ]
+        if distance is None:
+            return [agent for _, agent in seen]
+        return [agent for agent_distance, agent in seen if agent_distance <= distance]
@@ -1,6 +1,5 @@
 from typing import Tuple
 import mesa
-import numpy as np
 
 class VaccineFactory(mesa.Agent):
     def __init__(self, model: mesa.Model, vaccine_amount: int = 25, vaccine_frequency: int = 10, vaccine_effectiveness: int = 20, vaccine_lifetime: int = 50):
@@ -13,36 +12,32 @@ class VaccineFactory(mesa.Agent):
         """
         super().__init__(model.next_id(), model)
         self.vaccine_amount= vaccine_amount
-        self.iteration = 0
         self.frquency = vaccine_frequency
         self.model.scheduler.add(self)
         self.vaccine_efeectivness = vaccine_effectiveness
         self.vaccine_lifetime = vaccine_lifetime
+        if vaccine_frequency > 0:
+            self.model.timers.schedule(self.model.scheduler.first_step + vaccine_frequency - 1, self, "drop_vaccines")
 
-    def step(self) -> None:
+    def drop_vaccines(self) -> None:
         """
-        Performs a single of agent.
-        Create number of vaccine in given vaccine_frequency
+        Called by the timer in given vaccine_frequency.
+        Create number of vaccine and schedule the next batch.
 
         """
-        self.iteration += 1
-        if self.iteration == self.frquency:
-            self.iteration = 0
-            for _ in range(self.vaccine_amount):
-                height, width = self.model.map.shape
-                x = np.random.randint(0, width)
-                y = np.random.randint(0, height)
-                Vaccine.create(self.model, (y, self.model.height - 1 - x), self.vaccine_lifetime, self.vaccine_efeectivness)
+        positions = self.model.vaccine_rng.integers(0, (self.model.width, self.model.height), (self.vaccine_amount, 2))
+        for x, y in positions.tolist():
+            Vaccine.create(self.model, (x, y), self.vaccine_lifetime, self.vaccine_efeectivness)
+        self.model.timers.schedule(self.model.scheduler.steps + self.frquency, self, "drop_vaccines")
                 
 class Vaccine(mesa.Agent):
-    def __init__(self, model: mesa.Model, lifetime:int = 50, effectivness:int = 20):
+    def __init__(self, model: mesa.Model, effectivness:int = 20):
         """
         Class representing vaccine.
 
         @param: model - Mesa model.
         """
         super().__init__(model.next_id(), model)
-        self.lifetime: int = lifetime
         self.effectivness: int = effectivness
         
     def remove(self) -> None:
@@ -53,16 +48,6 @@ class Vaccine(mesa.Agent):
         self.model.grid.remove_agent(self)
         self.model.scheduler.remove(self)
         
-    def step(self) -> None:
-        """
-        Performs a single of agent.
-
-        """
-        if self.lifetime <= 0:
-            self.remove()
-        else:
-            self.lifetime -= 1
-    
     @staticmethod
     def create(model: mesa.Model, pos: Tuple[int, int], lifetime, effectivness) -> None:
         """
@@ -70,11 +55,13 @@ class Vaccine(mesa.Agent):
 
         @param: model - Mesa model.
         @param: pos - position of vaccine.
+        @param: lifetime - number of steps after which the vaccine is removed.
 
         """
-        vaccine = Vaccine(model, lifetime, effectivness)
+        vaccine = Vaccine(model, effectivness)
         model.grid.place_agent(vaccine, pos)
         model.scheduler.add(vaccine)
+        model.timers.schedule(model.scheduler.first_step + max(lifetime, 0), vaccine, "remove")
     
     
 
@@ -0,0 +1,89 @@
+from typing import Dict, List, Union
+import mesa
+import numpy as np
+
+from .animal import Animal, ViewDirection
+from .fox import Fox
+from .hare import Hare
+from .vision import view_cone
+
+
+class Visibility:
+    """
+    Matrix of the foxes seen by every hare in one step.
+
+    It is built at the start of the fox stage from the positions of all foxes and the positions and
+    view directions of all hares, with the view range and angle of the model's hare_params.
+    Hares neither move nor turn in the fox stage and a fox only moves in its own turn, so the matrix
+    answers Hare.sees for the rest of the stage. A pair is only answered while both animals stand where
+    the matrix saw them, other pairs are left to the grid query.
+    """
+    PROFILED_PHASES = ("build",)
+
+    def __init__(self, model: mesa.Model) -> None:
+        self.model = model
+        self.steps = None
+        self.foxes: Dict[int, int] = {}
+        self.hares: Dict[int, int] = {}
+        self.fox_pos = np.empty((0, 2), dtype=np.int64)
+        self.hare_pos = np.empty((0, 2), dtype=np.int64)
+        self.hare_directions = np.empty(0, dtype=np.int64)
+        self.hare_sees = np.empty((0, 0), dtype=bool)
+
+    @staticmethod
+    def in_cone(dx: np.ndarray, dy: np.ndarray, directions: np.ndarray, view_range: int, view_angle: int) -> np.ndarray:
+        """
+        Returns whether the offsets (dx, dy) are within the view range and cone of observers looking in the directions.
+        """
+        r = view_range
+        cones = np.zeros((8, 2 * r + 1, 2 * r + 1), dtype=bool)
+        for direction in ViewDirection:
+            cones[direction % 360 // 45] = view_cone(int(direction), r, view_angle)
+        # Most pairs are far apart, so the cones are only looked up for the near ones.
+        near = (np.abs(dx) <= r) & (np.abs(dy) <= r) & ((dx != 0) | (dy != 0))
+        index = np.nonzero(near)
+        directions = np.broadcast_to(directions, near.shape)[index]
+        near[index] = cones[directions % 360 // 45, dx[index] + r, dy[index] + r]
+        return near
+
+    def build(self, model: mesa.Model, foxes: List[Fox]) -> None:
+        """
+        Computes which of the given foxes every hare sees.
+        """
+        if model.hare_kernel:
+            hares = model.hare_kernel.hares
+            hare_pos = model.hare_kernel.pos[:len(hares)].copy()
+            hare_directions = model.hare_kernel.view_direction[:len(hares)].copy()
+        else:
+            hares = model.grid.get_agents_of_type(Hare)
+            hare_pos = np.array([hare.pos for hare in hares], dtype=np.int64).reshape(-1, 2)
+            hare_directions = np.array([int(hare.view_direction) for hare in hares], dtype=np.int64)
+        fox_pos = np.array([fox.pos for fox in foxes], dtype=np.int64).reshape(-1, 2)
+
+        dx = fox_pos[None, :, 0] - hare_pos[:, None, 0]
+        dy = fox_pos[None, :, 1] - hare_pos[:, None, 1]
+        params = model.hare_params
+        self.hare_sees = self.in_cone(dx, dy, hare_directions[:, None], params["view_range"], params["view_angle"])
+
+        self.foxes = {fox.unique_id: i for i, fox in enumerate(foxes)}
+        self.hares = {hare.unique_id: i for i, hare in enumerate(hares)}
+        self.fox_pos = fox_pos
+        self.hare_pos = hare_pos
+        self.hare_directions = hare_directions
+        self.steps = model.scheduler.steps
+
+    def lookup(self, observer: Animal, agent: Animal) -> Union[bool, None]:
+        """
+        Returns whether the hare observer sees the fox, or None if the matrix does not cover the pair.
+        """
+        if self.steps != self.model.scheduler.steps or not isinstance(observer, Hare) or not isinstance(agent, Fox):
+            return None
+        row, column = self.hares.get(observer.unique_id), self.foxes.get(agent.unique_id)
+        if row is None or column is None:
+            return None
+
+        if observer.pos != tuple(self.hare_pos[row].tolist()) or agent.pos != tuple(self.fox_pos[column].tolist()):
+            return None
+        if int(observer.view_direction) != self.hare_directions[row]:
+            return None
+        return bool(self.hare_sees[row, column])
@@ -0,0 +1,23 @@
+from functools import lru_cache
+import numpy as np
+
+
+@lru_cache(maxsize=None)
+def view_cone(view_direction: int, view_range: int, view_angle: int) -> np.ndarray:
+    """
+    Returns the cells seen by an animal as a read-only boolean mask of shape (2r + 1, 2r + 1),
+    indexed by [dx + r, dy + r] where (dx, dy) is the offset from the animal and r the view range.
+
+    Animals share a few parameter sets, so the masks are built once and cached.
+    """
+    offsets = np.arange(-view_range, view_range + 1)
+    dx, dy = np.meshgrid(offsets, offsets, indexing="ij")
+
+    angle_to_cell = np.degrees(np.arctan2(dy, dx)) % 360
+    angle_diff = np.abs((angle_to_cell - view_direction + 180) % 360 - 180)
+
+    cone = angle_diff <= view_angle // 2
+    cone[view_range, view_range] = False
+    cone.setflags(write=False)
+
+    return cone
@@ -0,0 +1,172 @@
+from typing import Dict, List, Tuple
+import numpy as np
+
+
+class FoodField:
+    """
+    Hare food layer of the model stored as an array of expiry ticks indexed by grid position (x, y).
+
+    A cell holds food while its expiry tick is greater than the current tick, 0 marks a cell without food.
+    Added cells are also filed under their expiry tick, so every tick only the cells filed under it are
+    checked for withering.
+
+    Alongside the expiry ticks the Chebyshev distance of every cell to the nearest food is kept up to
+    the radius; farther cells hold radius + 1. Cells where food appears, is eaten or withers are
+    collected and the distances around them are updated on the next read: new food lowers the distances
+    around it, and only the cells whose nearest food was removed are measured again.
+    """
+    PROFILED_PHASES = ("step",)
+
+    def __init__(self, width: int, height: int, radius: int = 1) -> None:
+        self.width = width
+        self.height = height
+        self.radius = radius
+        self.expiry = np.zeros((width, height), dtype=np.int64)
+        self.distance = np.full((width, height), radius + 1, dtype=np.int64)
+        self.tick = 0
+        self.count = 0
+        self._withering: Dict[int, List[np.ndarray]] = {}
+        self._added: List[np.ndarray] = []
+        self._removed: List[np.ndarray] = []
+        offsets = np.abs(np.arange(-radius, radius + 1))
+        self._kernel = np.maximum(offsets[:, None], offsets[None, :])
+
+    def __contains__(self, pos: Tuple[int, int]) -> bool:
+        return self.expiry[pos] > 0
+
+    def add(self, xs: np.ndarray, ys: np.ndarray, lifetime: int) -> None:
+        """
+        Places food on all given cells. Food already lying on a cell is refreshed.
+        """
+        cells = np.unique(np.ravel_multi_index((xs, ys), self.expiry.shape))
+        expiry = self.expiry.ravel()
+        added = cells[expiry[cells] == 0]
+        self.count += len(added)
+        tick = self.tick + lifetime + 1
+        extended = cells[expiry[cells] < tick]
+        expiry[extended] = tick
+        self._withering.setdefault(max(tick, self.tick + 1), []).append(extended)
+        self._added.append(added)
+
+    def eat(self, pos: Tuple[int, int]) -> bool:
+        """
+        Removes the food from the cell, returns False if there was none.
+        """
+        if self.expiry[pos] == 0:
+            return False
+        self.expiry[pos] = 0
+        self.count -= 1
+        self._removed.append(np.array([np.ravel_multi_index(pos, self.expiry.shape)]))
+        return True
+
+    def eat_all(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """
+        Removes the food from all given cells, returns a mask of the entries which ate.
+        Of entries sharing a cell only the first one eats.
+        """
+        cells = np.ravel_multi_index((xs, ys), self.expiry.shape)
+        expiry = self.expiry.ravel()
+        _, first = np.unique(cells, return_index=True)
+        ate = np.zeros(len(cells), dtype=bool)
+        ate[first] = expiry[cells[first]] > 0
+        expiry[cells[ate]] = 0
+        self.count -= np.count_nonzero(ate)
+        self._removed.append(cells[ate])
+        return ate
+
+    def positions(self, pos: Tuple[int, int], mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the coordinates of the food on the cells selected by the square mask centred on pos.
+        """
+        x, y = pos
+        r = mask.shape[0] // 2
+        x0, y0 = max(x - r, 0), max(y - r, 0)
+        window = self.expiry[x0:x + r + 1, y0:y + r + 1] > 0
+        window &= mask[x0 - x + r:x0 - x + r + window.shape[0], y0 - y + r:y0 - y + r + window.shape[1]]
+        xs, ys = window.nonzero()
+
+        return xs + x0, ys + y0
+
+    def step(self) -> None:
+        """
+        Advances the tick and removes the food that has withered.
+        """
+        self.tick += 1
+        cells = self._withering.pop(self.tick, None)
+        if not cells:
+            return
+        # Cells which were eaten or refreshed since they were filed do not wither now.
+        cells = np.concatenate(cells)
+        expiry = self.expiry.ravel()
+        withered = np.unique(cells[(expiry[cells] > 0) & (expiry[cells] <= self.tick)])
+        expiry[withered] = 0
+        self.count -= len(withered)
+        self._removed.append(withered)
+
+    def nearest(self, pos: Tuple[int, int]) -> int:
+        """
+        Returns the Chebyshev distance from pos to the nearest food, radius + 1 if there is none within the radius.
+        """
+        if self._added or self._removed:
+            self._update()
+        return self.distance[pos]
+
+    def _window(self, x: int, y: int, r: int) -> Tuple[int, int, int, int]:
+        """
+        Returns the bounds x0, x1, y0, y1 of the square of radius r around (x, y) clipped to the field.
+        """
+        return max(x - r, 0), min(x + r + 1, self.width), max(y - r, 0), min(y + r + 1, self.height)
+
+    def _update(self) -> None:
+        """
+        Brings the distances up to date with the food added and removed since the last update.
+        """
+        height = self.height
+        added = np.concatenate(self._added).tolist() if self._added else []
+        removed = np.concatenate(self._removed).tolist() if self._removed else []
+        self._added, self._removed = [], []
+        r = self.radius
+        if (len(added) + len(removed)) * (2 * r + 1) ** 2 >= self.expiry.size:
+            self.distance = self._transform(self.expiry > 0)
+            return
+
+        # Cells at the distance of a removed food may have lost their nearest food.
+        lost = []
+        for x, y in map(divmod, removed, [height] * len(removed)):
+            x0, x1, y0, y1 = self._window(x, y, r)
+            kernel = self._kernel[x0 - x + r:x1 - x + r, y0 - y + r:y1 - y + r]
+            lx, ly = np.nonzero(self.distance[x0:x1, y0:y1] == kernel)
+            if len(lx):
+                lost.append((lx + x0, ly + y0, x, y))
+
+        # Food which is still there lowers the distances around it.
+        for x, y in map(divmod, added, [height] * len(added)):
+            if self.expiry[x, y] == 0:
+                continue
+            x0, x1, y0, y1 = self._window(x, y, r)
+            window = self.distance[x0:x1, y0:y1]
+            np.minimum(window, self._kernel[x0 - x + r:x1 - x + r, y0 - y + r:y1 - y + r], out=window)
+
+        for lx, ly, x, y in lost:
+            x0, x1, y0, y1 = self._window(x, y, 2 * r)
+            fx, fy = np.nonzero(self.expiry[x0:x1, y0:y1] > 0)
+            distance = np.maximum(np.abs(fx + x0 - lx[:, None]), np.abs(fy + y0 - ly[:, None]))
+            self.distance[lx, ly] = distance.min(axis=1, initial=r + 1)
+
+    def _transform(self, food: np.ndarray) -> np.ndarray:
+        """
+        Returns the Chebyshev distance of every cell of the mask to its nearest food cell, capped at radius + 1.
+        Cells outside the mask count as empty.
+        """
+        r = self.radius
+        width, height = food.shape
+        padded = np.pad(food, r)
+
+        # Distance to the nearest food along x, then the nearest of these along y.
+        along_x = np.full((width, height + 2 * r), r + 1, dtype=np.int64)
+        for dx in range(-r, r + 1):
+            np.minimum(along_x, np.where(padded[r + dx:r + dx + width], abs(dx), r + 1), out=along_x)
+        distance = np.full((width, height), r + 1, dtype=np.int64)
+        for dy in range(-r, r + 1):
+            np.minimum(distance, np.maximum(along_x[:, r + dy:r + dy + height], abs(dy)), out=distance)
+        return distance
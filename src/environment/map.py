@@ -1,83 +1,153 @@
-import random
 import numpy as np
 import os
 
 current_dir = os.path.dirname(__file__)
 
 
-def create_map(model_height: int, model_width: int) -> np.ndarray:
+def load_layout(path: str) -> np.ndarray:
     """
-    Reponsible for loading a file with map information. Each line in file represents each line
-    in 20x20 grid, and each number represents which area is meadow ( for hares ) or forest ( for foxes) 
-    It creates numpy array of size 20x20. 0 represents meadow and 1 represents forest.
-    
+    Reads a text layout, each line is a row of the map listing the (1-based) columns covered by forest.
+    The map is a square with the side of the number of lines or of the largest column, if larger.
+
     Returns:
         np.ndarray: Map with 0 and 1:
-        - 0 represents meadow 
+        - 0 represents meadow
         - 1 represents forest.
     """
-    with open(f"{current_dir}/layout.txt", "r") as f:
-        map_vectors = np.zeros((20, 20))
-        for x_axis, line in enumerate(f.readlines()):
-            forest_areas = line.split(",")
-            for y_axis in [int(i) for i in forest_areas]:
-                map_vectors[x_axis][y_axis - 1] = 1
-    ratio_x = model_width / map_vectors.shape[0]
-    ratio_y = model_height / map_vectors.shape[1]
-    map = np.repeat(np.repeat(map_vectors, ratio_y, axis=0), ratio_x, axis=1)
-    return map
-
-
-def add_food_to_map(map, number_of_plants, number_of_hare_habitats, number_of_fox_habitats):
+    with open(path, "r") as f:
+        rows = [[int(i) for i in line.split(",") if i.strip()] for line in f.readlines()]
+    side = max([len(rows)] + [column for row in rows for column in row])
+    terrain = np.zeros((side, side), dtype=np.int8)
+    for y_axis, columns in enumerate(rows):
+        terrain[y_axis, np.array(columns, dtype=int) - 1] = 1
+    return terrain
+
+
+def load_terrain(path: str | None = None) -> np.ndarray:
+    """
+    Loads a terrain map of any size, rows first, with 0 for meadow and 1 for forest.
+
+    Supported formats:
+        - .npy: NumPy array, memory-mapped so only the cells used by the model are read,
+        - .csv: dense comma separated rows of cell values,
+        - anything else: text layout, see load_layout.
+    Without a path the bundled 20x20 layout.txt is loaded.
+    """
+    path = path or f"{current_dir}/layout.txt"
+    if path.endswith(".npy"):
+        return np.load(path, mmap_mode="r")
+    if path.endswith(".csv"):
+        return np.loadtxt(path, delimiter=",", dtype=np.int8, ndmin=2)
+    return load_layout(path)
+
+
+def resample_terrain(terrain: np.ndarray, model_height: int, model_width: int) -> np.ndarray:
+    """
+    Resamples the terrain to the model size with the nearest neighbour of every model cell.
+
+    Returns:
+        np.ndarray: Map of shape (model_height, model_width) as int8.
+    """
+    rows = np.arange(model_height) * terrain.shape[0] // model_height
+    columns = np.arange(model_width) * terrain.shape[1] // model_width
+    return np.asarray(terrain[np.ix_(rows, columns)], dtype=np.int8)
+
+
+def create_map(model_height: int, model_width: int, path: str | None = None) -> np.ndarray:
+    """
+    Reponsible for loading the terrain (see load_terrain) and resampling it to the model size.
+
+    Returns:
+        np.ndarray: Map with 0 and 1:
+        - 0 represents meadow
+        - 1 represents forest.
+    """
+    return resample_terrain(load_terrain(path), model_height, model_width)
+
+
+def place_apart(rows: np.ndarray, cols: np.ndarray, count: int, min_distance: float, rng: np.random.Generator) -> np.ndarray:
+    """
+    Picks count of the candidate cells (rows, cols) so that every two picked cells are more than
+    min_distance apart.
+
+    Candidates are tried once each in random order (dart throwing), so the placement always terminates.
+    Picked cells are hashed into buckets of side min_distance / sqrt(2), which hold at most one cell each,
+    so every try only looks at the 5x5 buckets around the candidate.
+
+    Returns:
+        np.ndarray: Indexes of the picked candidates.
+
+    Raises:
+        ValueError: If fewer than count cells are picked after trying every candidate. The greedy order
+            may give up even when a layout with count cells exists.
+    """
+    if count > len(rows):
+        raise ValueError(f"Cannot place {count} habitats on {len(rows)} cells")
+    if min_distance <= 0:
+        return rng.choice(len(rows), size=count, replace=False)
+
+    bucket_size = min_distance / np.sqrt(2)
+    reach = int(np.ceil(min_distance / bucket_size))
+    buckets = {}
+    picked = []
+    order = rng.permutation(len(rows))
+    # Candidates are converted in chunks, usually only the first few are needed.
+    for start in range(0, len(order), 1024):
+        if len(picked) == count:
+            break
+        chunk = order[start:start + 1024]
+        for i, row, col in zip(chunk.tolist(), rows[chunk].tolist(), cols[chunk].tolist()):
+            bucket_row, bucket_col = int(row // bucket_size), int(col // bucket_size)
+            too_close = False
+            for r in range(bucket_row - reach, bucket_row + reach + 1):
+                for c in range(bucket_col - reach, bucket_col + reach + 1):
+                    other = buckets.get((r, c))
+                    if other and (other[0] - row) ** 2 + (other[1] - col) ** 2 <= min_distance ** 2:
+                        too_close = True
+                        break
+                if too_close:
+                    break
+            if not too_close:
+                buckets[(bucket_row, bucket_col)] = (row, col)
+                picked.append(i)
+                if len(picked) == count:
+                    break
+
+    if len(picked) < count:
+        raise ValueError(
+            f"Gave up placing {count} habitats more than {min_distance} cells apart after {len(rows)} attempts "
+            f"(every candidate cell once), placed {len(picked)}; lower the number of habitats or their distance"
+        )
+    return np.array(picked, dtype=int)
+
+
+def add_food_to_map(map, number_of_plants, number_of_hare_habitats, number_of_fox_habitats, rng=None):
     """
     Places plants, hare habitats and fox habitats on the map.
+    Fox habitats are placed more than 20 cells apart and hare habitats more than 5 cells apart.
 
     Args:
         map (np.ndarray): Map to place habitats on.
         number_of_plants (int): Number of plants to place.
         number_of_hare_habitats (int): Number of hare habitats to place.
         number_of_fox_habitats (int): Number of fox habitats to place.
+        rng (np.random.Generator): Random generator used for the placement.
 
     Returns:
         np.ndarray: Updated array with 0,1,2,3,4 values only.
+
+    Raises:
+        ValueError: If the habitats do not fit on the map.
     """
+    rng = rng if rng is not None else np.random.default_rng()
     updated_map = map.copy()
     meadow_indexes = np.where(updated_map == 0)
     forest_indexes = np.where(updated_map == 1)
     meadow_size = meadow_indexes[0].size
-    forest_size = forest_indexes[0].size
-
-    plant_indexes = np.random.choice(meadow_size, size=number_of_plants, replace=False)
-    hare_habitat_indexes = np.random.choice(meadow_size, size=number_of_hare_habitats, replace=False)
-    fox_habitat_indexes = np.random.choice(forest_size, size=number_of_fox_habitats, replace=False)
-
-    are_fox_habitats_close = True
-    while are_fox_habitats_close:
-        are_fox_habitats_close = False
-        fox_habitat_positions = forest_indexes[0][fox_habitat_indexes], forest_indexes[1][fox_habitat_indexes]
-        for i in range(len(fox_habitat_positions[0])):
-            for j in range(i + 1, len(fox_habitat_positions[0])):
-                if np.sqrt((fox_habitat_positions[0][i] - fox_habitat_positions[0][j]) ** 2 +
-                           (fox_habitat_positions[1][i] - fox_habitat_positions[1][j]) ** 2) <= 20:
-                    are_fox_habitats_close = True
-                    break
-        if are_fox_habitats_close:
-            fox_habitat_indexes = np.random.choice(forest_size, size=number_of_fox_habitats, replace=False)
-
-    are_hares_habitats_close = True
-    while are_hares_habitats_close:
-        are_hares_habitats_close = False
-        hare_habitat_positions = meadow_indexes[0][hare_habitat_indexes], meadow_indexes[1][hare_habitat_indexes]
-        for i in range(len(hare_habitat_positions[0])):
-            for j in range(i + 1, len(hare_habitat_positions[0])):
-                if np.sqrt((hare_habitat_positions[0][i] - hare_habitat_positions[0][j]) ** 2 +
-                           (hare_habitat_positions[1][i] - hare_habitat_positions[1][j]) ** 2) <= 5:
-                    are_hares_habitats_close = True
-                    break
-        if are_hares_habitats_close:
-            hare_habitat_indexes = np.random.choice(meadow_size, size=number_of_hare_habitats, replace=False)
-    
 
+    plant_indexes = rng.choice(meadow_size, size=number_of_plants, replace=False)
+    fox_habitat_indexes = place_apart(*forest_indexes, number_of_fox_habitats, 20, rng)
+    hare_habitat_indexes = place_apart(*meadow_indexes, number_of_hare_habitats, 5, rng)
 
     updated_map[meadow_indexes[0][plant_indexes], meadow_indexes[1][plant_indexes]] = 2
     updated_map[meadow_indexes[0][hare_habitat_indexes], meadow_indexes[1][hare_habitat_indexes]] = 3
@@ -0,0 +1,142 @@
+from typing import Iterator, Tuple, Union
+import numpy as np
+
+
+class PheromoneField:
+    """
+    Pheromone layer of the model stored as a float array indexed by grid position (x, y).
+
+    Each tick the whole layer is evaporated and diffused with a single stencil update,
+    which replaces the per-cell Pheromone agents. Two rules differ from those agents: the diffusion
+    average divides by the number of in-bounds neighbour cells instead of the number of agents around
+    the cell, and pheromone spreads into the cells without pheromone instead of the cells without agents,
+    so animals, habitats and vaccines no longer affect it.
+
+    The maximum of every square tile is kept alongside the values, so strongest only scans the tiles
+    which can hold the answer. Tile maxima are recomputed every tick and raised on every deposit;
+    overwriting a cell with a lower value leaves its tile maximum as an upper bound.
+    """
+    MIN_VALUE = 0.1
+    TILE_SIZE = 8
+    PROFILED_PHASES = ("step",)
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        evaporation_rate: float = 0.4,
+        diffusion_rate: float = 0.1,
+        tile_size: int = TILE_SIZE
+    ) -> None:
+        self.width = width
+        self.height = height
+        self.evaporation_rate = evaporation_rate
+        self.diffusion_rate = diffusion_rate
+        self.tile_size = tile_size
+        self.values = np.zeros((width, height))
+        self.tile_max = np.zeros((-(-width // tile_size), -(-height // tile_size)))
+        self._padded = np.zeros((width + 2, height + 2))
+
+        # Number of in-bounds Moore neighbours of every cell.
+        self._padded[1:-1, 1:-1] = 1
+        self._neighbours = sum(self._shifted(self._padded))
+        self._padded[:] = 0
+
+    def __getitem__(self, pos: Tuple[int, int]) -> float:
+        return self.values[pos]
+
+    def __setitem__(self, pos: Tuple[int, int], value: float) -> None:
+        x, y = pos
+        self.values[x, y] = value
+        tile = x // self.tile_size, y // self.tile_size
+        if value > self.tile_max[tile]:
+            self.tile_max[tile] = value
+
+    def deposit(self, xs: np.ndarray, ys: np.ndarray, value: float) -> None:
+        """
+        Sets the pheromone of all given cells to the value.
+        """
+        self.values[xs, ys] = value
+        np.maximum.at(self.tile_max, (xs // self.tile_size, ys // self.tile_size), value)
+
+    def _refresh_tiles(self) -> None:
+        """
+        Recomputes the maximum of every tile.
+        """
+        starts = np.arange(0, self.width, self.tile_size)
+        columns = np.maximum.reduceat(self.values, starts, axis=0)
+        self.tile_max = np.maximum.reduceat(columns, np.arange(0, self.height, self.tile_size), axis=1)
+
+    def _shifted(self, padded: np.ndarray) -> Iterator[np.ndarray]:
+        """
+        Yields views of the padded array shifted onto each of the 8 Moore neighbours.
+        """
+        for dx in (0, 1, 2):
+            for dy in (0, 1, 2):
+                if dx != 1 or dy != 1:
+                    yield padded[dx:dx + self.width, dy:dy + self.height]
+
+    def step(self) -> None:
+        """
+        Evaporates and diffuses the pheromone, then spreads it into the empty neighbour cells.
+        """
+        values = self.values
+        empty = values == 0
+
+        self._padded[1:-1, 1:-1] = values
+        avg_value = sum(self._shifted(self._padded)) / self._neighbours
+        updated = (1 - self.evaporation_rate) * values + self.diffusion_rate * (avg_value - values)
+        updated[updated < PheromoneField.MIN_VALUE] = 0
+
+        self._padded[1:-1, 1:-1] = updated
+        spread = np.maximum.reduce(list(self._shifted(self._padded)))
+        updated[empty] = spread[empty]
+
+        self.values = updated
+        self._refresh_tiles()
+
+    def strongest(self, pos: Tuple[int, int], radius: int) -> Union[Tuple[int, int], None]:
+        """
+        Returns the position with the highest pheromone value within the radius around pos,
+        without the pos itself, or None if there is no pheromone there.
+        """
+        x, y = pos
+        x0, x1 = max(x - radius, 0), min(x + radius, self.width - 1) + 1
+        y0, y1 = max(y - radius, 0), min(y + radius, self.height - 1) + 1
+        size = self.tile_size
+        tx0, ty0 = x0 // size, y0 // size
+        bounds = self.tile_max[tx0:(x1 - 1) // size + 1, ty0:(y1 - 1) // size + 1]
+        columns = bounds.shape[1]
+
+        # Tiles are scanned from the highest maximum until no remaining tile can hold a higher value.
+        # Tiles cut by the window, the tile of pos and lowered cells make a maximum only an upper bound.
+        best, cell = 0.0, None
+        scanned = False
+        while True:
+            index = int(bounds.argmax())
+            bound = bounds.item(index)
+            if bound <= best:
+                return cell
+
+            tx, ty = divmod(index, columns)
+            cx0, cy0 = (tx0 + tx) * size, (ty0 + ty) * size
+            cx1, cy1 = cx0 + size, cy0 + size
+            cx0, cx1 = cx0 if cx0 > x0 else x0, cx1 if cx1 < x1 else x1
+            cy0, cy1 = cy0 if cy0 > y0 else y0, cy1 if cy1 < y1 else y1
+            tile = self.values[cx0:cx1, cy0:cy1]
+            if cx0 <= x < cx1 and cy0 <= y < cy1:
+                tile = tile.copy()
+                tile[x - cx0, y - cy0] = 0
+
+            local = int(tile.argmax())
+            value = tile.item(local)
+            if value > best:
+                dx, dy = divmod(local, cy1 - cy0)
+                best, cell = value, (cx0 + dx, cy0 + dy)
+            if value == bound:
+                return cell
+
+            if not scanned:
+                bounds = bounds.copy()
+                scanned = True
+            bounds.flat[index] = 0
@@ -0,0 +1,129 @@
+from typing import List, NamedTuple, Tuple
+import numpy as np
+
+
+class SoundWindow(NamedTuple):
+    """
+    Part of the sound field heard from one position.
+    """
+    values: np.ndarray
+    origin: Tuple[int, int]
+
+    def get(self, pos: Tuple[int, int], default: float = 0) -> float:
+        x = pos[0] - self.origin[0]
+        y = pos[1] - self.origin[1]
+        if 0 <= x < self.values.shape[0] and 0 <= y < self.values.shape[1]:
+            return self.values[x, y]
+        return default
+
+
+class SoundField:
+    """
+    Sound layer of the model stored as an intensity array indexed by grid position (x, y).
+
+    Every noise is kept as a wavefront record (origin, radius, force). The wavefront is a square
+    ring around its origin which keeps the force of the noise at radius 1 until the next tick,
+    then grows by one cell every tick and fades as FORCE / r ** 2, until it drops below MIN_FORCE.
+
+    The version grows whenever the intensity changes, the danger map is rebuilt on the first read
+    of a new version.
+    """
+    FORCE = 10.0
+    MIN_FORCE = 0.1
+    PROFILED_PHASES = ("step",)
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.intensity = np.zeros((width, height))
+        self._xs = np.empty(0, dtype=int)
+        self._ys = np.empty(0, dtype=int)
+        self._radius = np.empty(0, dtype=int)
+        self._force = np.empty(0)
+        self._emitted: List[Tuple[int, int, float]] = []
+        self.version = 0
+        self._danger = np.zeros((width, height))
+        self._danger_version = 0
+        self._padded = np.zeros((width + 2, height + 2))
+
+    def __getitem__(self, pos: Tuple[int, int]) -> float:
+        return self.intensity[pos]
+
+    def __len__(self) -> int:
+        return len(self._radius) + len(self._emitted)
+
+    def _paint(self, x: int, y: int, r: int, force: float) -> None:
+        """
+        Draws the ring of radius r around (x, y) into the intensity array.
+        """
+        x0, x1 = max(x - r, 0), min(x + r, self.width - 1)
+        y0, y1 = max(y - r, 0), min(y + r, self.height - 1)
+        if y - r >= 0:
+            np.maximum(self.intensity[x0:x1 + 1, y - r], force, out=self.intensity[x0:x1 + 1, y - r])
+        if y + r < self.height:
+            np.maximum(self.intensity[x0:x1 + 1, y + r], force, out=self.intensity[x0:x1 + 1, y + r])
+        if x - r >= 0:
+            np.maximum(self.intensity[x - r, y0:y1 + 1], force, out=self.intensity[x - r, y0:y1 + 1])
+        if x + r < self.width:
+            np.maximum(self.intensity[x + r, y0:y1 + 1], force, out=self.intensity[x + r, y0:y1 + 1])
+
+    def emit(self, pos: Tuple[int, int], force: float) -> None:
+        """
+        Creates noise of the given force on the cells around pos.
+        """
+        x, y = pos
+        self._emitted.append((x, y, force))
+        self._paint(x, y, 1, force)
+        self.version += 1
+
+    def step(self) -> None:
+        """
+        Propagates the wavefronts of earlier ticks by one cell, adds the noises emitted in this tick
+        at radius 1 with their own force and redraws the intensity array.
+        """
+        self._radius += 1
+        self._force = SoundField.FORCE / self._radius ** 2
+        audible = self._force >= SoundField.MIN_FORCE
+        self._xs = self._xs[audible]
+        self._ys = self._ys[audible]
+        self._radius = self._radius[audible]
+        self._force = self._force[audible]
+
+        if self._emitted:
+            xs, ys, forces = zip(*self._emitted)
+            self._xs = np.concatenate((self._xs, xs))
+            self._ys = np.concatenate((self._ys, ys))
+            self._radius = np.concatenate((self._radius, np.ones(len(xs), dtype=int)))
+            self._force = np.concatenate((self._force, forces))
+            self._emitted = []
+
+        self.intensity[:] = 0
+        for x, y, r, force in zip(self._xs.tolist(), self._ys.tolist(), self._radius.tolist(), self._force.tolist()):
+            self._paint(x, y, r, force)
+        self.version += 1
+
+    def danger(self) -> np.ndarray:
+        """
+        Returns the sound summed over the 3x3 square around every cell, indexed by grid position (x, y).
+        """
+        if self._danger_version != self.version:
+            self._padded[1:-1, 1:-1] = self.intensity
+            # Summed in the order of the cells of hare.get_surrounding_points.
+            danger = 0
+            for dx in range(3):
+                for dy in range(3):
+                    danger = danger + self._padded[dx:dx + self.width, dy:dy + self.height]
+            self._danger = danger
+            self._danger_version = self.version
+        return self._danger
+
+    def listen(self, pos: Tuple[int, int], radius: int) -> SoundWindow:
+        """
+        Returns the sound heard within the radius around pos, without the pos itself.
+        """
+        x, y = pos
+        x0, y0 = max(x - radius, 0), max(y - radius, 0)
+        values = self.intensity[x0:x + radius + 1, y0:y + radius + 1].copy()
+        values[x - x0, y - y0] = 0
+
+        return SoundWindow(values, (x0, y0))
@@ -0,0 +1,75 @@
+from collections import defaultdict
+from typing import Dict, List, Tuple, Type, Union
+import mesa
+
+
+def class_of(agent: mesa.Agent) -> type:
+    """
+    Returns the class the agent is indexed, counted and scheduled under,
+    the base_class of agents which stand in for another class or else their own class.
+    """
+    return getattr(agent, "base_class", None) or type(agent)
+
+
+class IndexedMultiGrid(mesa.space.MultiGrid):
+    """
+    MultiGrid which additionally keeps its agents bucketed per class in square tiles,
+    so neighbours of one class can be found without walking the agents of other classes.
+    """
+    TILE_SIZE = 8
+
+    def __init__(self, width: int, height: int, torus: bool, tile_size: int = TILE_SIZE) -> None:
+        super().__init__(width, height, torus)
+        self.tile_size = tile_size
+        self._index: Dict[type, Dict[Tuple[int, int], Dict[mesa.Agent, None]]] = defaultdict(dict)
+
+    def _tile(self, pos: Tuple[int, int]) -> Tuple[int, int]:
+        return pos[0] // self.tile_size, pos[1] // self.tile_size
+
+    def place_agent(self, agent: mesa.Agent, pos: Tuple[int, int]) -> None:
+        super().place_agent(agent, pos)
+        self._index[class_of(agent)].setdefault(self._tile(agent.pos), {})[agent] = None
+
+    def remove_agent(self, agent: mesa.Agent) -> None:
+        tile = self._tile(agent.pos)
+        super().remove_agent(agent)
+        tiles = self._index[class_of(agent)]
+        del tiles[tile][agent]
+        if not tiles[tile]:
+            del tiles[tile]
+
+    def get_agents_of_type(self, agent_type: Type[mesa.Agent]) -> List[mesa.Agent]:
+        """
+        Returns all agents of the given class placed on the grid.
+        """
+        return [agent for tile in self._index.get(agent_type, {}).values() for agent in tile]
+
+    def get_neighbors_of_type(
+        self,
+        pos: Tuple[int, int],
+        agent_type: Union[Type[mesa.Agent], Tuple[Type[mesa.Agent], ...]],
+        radius: int = 1,
+        include_center: bool = False
+    ) -> List[mesa.Agent]:
+        """
+        Returns agents of the given class (or classes) in the Moore neighbourhood of the given radius.
+        """
+        x, y = pos
+        first_x, first_y = self._tile((max(x - radius, 0), max(y - radius, 0)))
+        last_x, last_y = self._tile((x + radius, y + radius))
+        agent_types = agent_type if isinstance(agent_type, tuple) else (agent_type,)
+
+        neighbors = []
+        for agent_type in agent_types:
+            tiles = self._index.get(agent_type)
+            if not tiles:
+                continue
+            for tile_x in range(first_x, last_x + 1):
+                for tile_y in range(first_y, last_y + 1):
+                    for agent in tiles.get((tile_x, tile_y), ()):
+                        dx = agent.pos[0] - x
+                        dy = agent.pos[1] - y
+                        if abs(dx) <= radius and abs(dy) <= radius and (include_center or dx or dy):
+                            neighbors.append(agent)
+
+        return neighbors
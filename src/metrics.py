@@ -0,0 +1,169 @@
+import csv
+import os
+import struct
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class MetricsWriter(ABC):
+    """
+    Append-only sink for the model reporters.
+
+    Rows are buffered in memory and appended to the output file in batches of flush_interval rows,
+    so every step costs only the new row instead of rewriting the whole table.
+    """
+
+    def __init__(self, path: str, flush_interval: int = 100) -> None:
+        self.path = path
+        self.flush_interval = max(1, flush_interval)
+        self.columns: List[str] = None
+        self._rows: List[Tuple[int, List[Any]]] = []
+        self._created = False
+
+    def write(self, step: int, row: Dict[str, Any]) -> None:
+        """
+        Buffers one row of reporter values, flushes the buffer when it is full.
+        """
+        if self.columns is None:
+            self.columns = list(row)
+        self._rows.append((step, [row[column] for column in self.columns]))
+        if len(self._rows) >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Appends the buffered rows to the output file.
+        """
+        if not self._rows:
+            return
+        if not self._created:
+            self._create()
+            self._created = True
+        self._append(self._rows)
+        self._rows = []
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_size"] = os.path.getsize(self.path) if self._created else 0
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        size = state.pop("_size")
+        self.__dict__.update(state)
+        # Rows written after the state was saved are going to be written again.
+        if self._created and os.path.exists(self.path) and os.path.getsize(self.path) > size:
+            os.truncate(self.path, size)
+
+    @abstractmethod
+    def _create(self) -> None:
+        """
+        Creates the output file and writes its header.
+        """
+        pass
+
+    @abstractmethod
+    def _append(self, rows: List[Tuple[int, List[Any]]]) -> None:
+        """
+        Appends rows to the already created output file.
+        """
+        pass
+
+
+class CsvMetricsWriter(MetricsWriter):
+    """
+    Writes the same layout as DataCollector.get_model_vars_dataframe().to_csv().
+    """
+
+    def _create(self) -> None:
+        with open(self.path, "w", newline="") as f:
+            csv.writer(f).writerow([""] + self.columns)
+
+    def _append(self, rows: List[Tuple[int, List[Any]]]) -> None:
+        with open(self.path, "a", newline="") as f:
+            writer = csv.writer(f)
+            for step, values in rows:
+                writer.writerow([step] + values)
+
+
+class ColumnarMetricsWriter(MetricsWriter):
+    """
+    Writes a compact binary columnar file.
+
+    The header holds the magic, the format version and the name and dtype of every column.
+    Every flush appends one chunk: the number of rows followed by the step index and each column
+    stored as a contiguous little-endian array.
+    """
+    MAGIC = b"WSMETRIC"
+    VERSION = 1
+
+    def _create(self) -> None:
+        self._dtypes = [np.dtype("<i8")] + [
+            np.dtype("<i8") if isinstance(value, (int, np.integer)) else np.dtype("<f8")
+            for value in self._rows[0][1]
+        ]
+        with open(self.path, "wb") as f:
+            f.write(self.MAGIC)
+            f.write(struct.pack("<HH", self.VERSION, len(self.columns)))
+            for column, dtype in zip(self.columns, self._dtypes[1:]):
+                name = column.encode()
+                f.write(struct.pack("<H", len(name)) + name + dtype.char.encode())
+
+    def _append(self, rows: List[Tuple[int, List[Any]]]) -> None:
+        steps = [step for step, _ in rows]
+        columns = [steps] + [list(column) for column in zip(*(values for _, values in rows))]
+        with open(self.path, "ab") as f:
+            f.write(struct.pack("<I", len(rows)))
+            for column, dtype in zip(columns, self._dtypes):
+                f.write(np.asarray(column, dtype=dtype).tobytes())
+
+
+def read_columnar_metrics(path: str) -> pd.DataFrame:
+    """
+    Reads a file written by ColumnarMetricsWriter into a DataFrame indexed by step.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    magic = ColumnarMetricsWriter.MAGIC
+    if data[:len(magic)] != magic:
+        raise ValueError(f"{path} is not a metrics file")
+    offset = len(magic)
+    version, number_of_columns = struct.unpack_from("<HH", data, offset)
+    if version != ColumnarMetricsWriter.VERSION:
+        raise ValueError(f"Unsupported metrics file version {version}")
+    offset += 4
+
+    columns = []
+    dtypes = [np.dtype("<i8")]
+    for _ in range(number_of_columns):
+        (length,) = struct.unpack_from("<H", data, offset)
+        offset += 2
+        columns.append(data[offset:offset + length].decode())
+        dtypes.append(np.dtype(data[offset + length:offset + length + 1].decode()).newbyteorder("<"))
+        offset += length + 1
+
+    chunks = [[] for _ in dtypes]
+    while offset < len(data):
+        (rows,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        for chunk, dtype in zip(chunks, dtypes):
+            chunk.append(np.frombuffer(data, dtype=dtype, count=rows, offset=offset))
+            offset += rows * dtype.itemsize
+
+    values = [np.concatenate(chunk) if chunk else np.empty(0, dtype=dtype) for chunk, dtype in zip(chunks, dtypes)]
+    return pd.DataFrame(dict(zip(columns, values[1:])), index=values[0])
+
+
+def create_metrics_writer(path: str, flush_interval: int = 100) -> MetricsWriter:
+    """
+    Creates the writer matching the extension of the path, .csv or .wsm.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return CsvMetricsWriter(path, flush_interval)
+    if extension == ".wsm":
+        return ColumnarMetricsWriter(path, flush_interval)
+    raise ValueError(f"Unsupported metrics format: {extension}")
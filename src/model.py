@@ -1,16 +1,41 @@
-from typing import Any, Tuple
+from functools import partial
+import random
+import weakref
+from typing import Any, Dict, Tuple
 import mesa
 import numpy as np
 
 from .agents.vaccine_factory import Vaccine, VaccineFactory
 from .agents import *
 from .environment.map import create_map, add_food_to_map
-from .environment.map import create_map, add_food_to_map
+from .environment.pheromone import PheromoneField
+from .environment.sound import SoundField
+from .environment.food import FoodField
+from .environment.space import IndexedMultiGrid
+from .metrics import create_metrics_writer
+from .schedule import StagedScheduler
+from .timers import TimerQueue
+from .snapshot import save_snapshot, load_snapshot
+from .profiling import StepProfiler
 from .agents.fox_habitat import FoxHabitat
 from .agents.hare_habitat import HareHabitat
-from .agents.hare_food import HareFood
 
 from .agents.hare_food_factory import HareFoodFactory
+from .agents.hare_kernel import HareKernel
+from .agents.fox_kernel import FoxKernel
+from .agents.visibility import Visibility
+
+
+def count_all_agents(model: mesa.Model) -> int:
+    return model.scheduler.get_agent_count()
+
+
+def count_agents(model: mesa.Model, agent_type: type) -> int:
+    return model.scheduler.get_type_count(agent_type)
+
+
+def count_food(model: mesa.Model) -> int:
+    return model.food.count
 
 
 class SimulationModel(mesa.Model):
@@ -64,21 +89,46 @@ class SimulationModel(mesa.Model):
         vaccine_lifetime: int,
         vaccine_effectiveness: int,
         iterations: int = 100,
+        width: int = 200,
+        height: int = 200,
+        terrain: str | None = None,
+        metrics_path: str | None = "data.csv",
+        metrics_flush_interval: int = 100,
+        snapshot_path: str | None = None,
+        snapshot_interval: int = 1000,
+        seed: int | None = None,
+        profile: bool = False,
+        vectorized_hares: bool = False,
+        vectorized_foxes: bool = False,
         *args: Any,
         **kwargs: Any
     ):
         super().__init__(*args, **kwargs)
 
-        # self.width = 40
-        # self.height = 40
-        # self.width = 370
-        # self.height = 370
-        self.width = 200
-        self.height = 200
+        # Every source of randomness gets its own stream derived from the single seed.
+        seed_sequence = np.random.SeedSequence(seed)
+        self._seed = seed_sequence.entropy
+        (
+            animals_seed, terrain_seed, habitats_seed, food_seed, vaccines_seed, hares_seed, foxes_seed
+        ) = seed_sequence.spawn(7)
+        self.random = random.Random(int(animals_seed.generate_state(1)[0]))
+        self.terrain_rng = np.random.default_rng(terrain_seed)
+        self.habitat_rng = np.random.default_rng(habitats_seed)
+        self.food_rng = np.random.default_rng(food_seed)
+        self.vaccine_rng = np.random.default_rng(vaccines_seed)
+        self.hare_rng = np.random.default_rng(hares_seed)
+        self.fox_rng = np.random.default_rng(foxes_seed)
+
+        self.profiler = StepProfiler() if profile else None
+
+        self.width = width
+        self.height = height
 
-        self.grid = mesa.space.MultiGrid(self.width, self.height, False)
+        self.grid = IndexedMultiGrid(self.width, self.height, False)
 
         self.iterations = iterations
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval
         self.one_week = one_week
 
         self.num_of_hares = initial_hare
@@ -139,49 +189,147 @@ class SimulationModel(mesa.Model):
             "vaccine_lifetime": vaccine_lifetime,
         }
 
+        self.pheromones = PheromoneField(self.width, self.height, **self.pheromone_params)
+        self.sounds = SoundField(self.width, self.height)
+        self.food = FoodField(self.width, self.height, radius=hare_view_range)
+        if self.profiler:
+            for field in (self.pheromones, self.sounds, self.food):
+                self.profiler.instrument(field)
     
-        self.scheduler = mesa.time.BaseScheduler(self)
+        self.hare_kernel = HareKernel(self) if vectorized_hares else None
+        batched = {}
+        if self.hare_kernel:
+            batched[Hare] = self.hare_kernel.step_all
+        self.fox_kernel = FoxKernel(self) if vectorized_foxes else None
+        if self.fox_kernel:
+            batched[Fox] = self.fox_kernel.step_all
+        self.visibility = Visibility(self)
+        if self.profiler:
+            self.profiler.instrument(self.visibility)
+        self.timers = TimerQueue()
+
+        # Hares act before foxes and the fields step after both, so hares react to the noise foxes made
+        # in the previous step: it is still the ring of radius 1 with the force of the fox state.
+        self.scheduler = StagedScheduler(
+            self,
+            stages=[
+                (FoxHabitat, HareHabitat, HareFoodFactory, VaccineFactory),
+                (Hare,),
+                (Fox,),
+                (Vaccine,),
+            ],
+            environment=[self.pheromones, self.sounds, self.food],
+            batched=batched,
+            prepare={Fox: self.visibility.build},
+            timers=self.timers,
+            timed=(FoxHabitat, HareHabitat, HareFoodFactory, VaccineFactory, Vaccine)
+        )
         self.datacollector = mesa.datacollection.DataCollector(
             model_reporters={
-                "agent_count": lambda m: m.scheduler.get_agent_count(),
-                "Hare": lambda m: len(list(filter(lambda a: type(a) is Hare, m.scheduler.agents))),
-                "Fox": lambda m: len(list(filter(lambda a: type(a) is Fox, m.scheduler.agents))),
-                "Grass": lambda m: len(list(filter(lambda a: type(a) is HareFood, m.scheduler.agents))),
-                "FoxHabitat": lambda m: len(list(filter(lambda a: type(a) is FoxHabitat, m.scheduler.agents))),
-                "HareHabitat": lambda m: len(list(filter(lambda a: type(a) is HareHabitat, m.scheduler.agents))),
-                "Vaccine": lambda m: len(list(filter(lambda a: type(a) is Vaccine, m.scheduler.agents)))
+                "agent_count": count_all_agents,
+                "Hare": partial(count_agents, agent_type=Hare),
+                "Fox": partial(count_agents, agent_type=Fox),
+                "Grass": count_food,
+                "FoxHabitat": partial(count_agents, agent_type=FoxHabitat),
+                "HareHabitat": partial(count_agents, agent_type=HareHabitat),
+                "Vaccine": partial(count_agents, agent_type=Vaccine)
             }
         )
 
-        map = create_map(self.height, self.width)
+        self.metrics = create_metrics_writer(metrics_path, metrics_flush_interval) if metrics_path else None
+        self._flush_metrics_on_teardown()
+
+        map = create_map(self.height, self.width, terrain)
         self.map = add_food_to_map(
-            map, self.number_of_plant, self.number_of_hares_habitats, self.number_of_foxes_habitats
+            map, self.number_of_plant, self.number_of_hares_habitats, self.number_of_foxes_habitats, self.terrain_rng
         )
 
-        agent_mapping = {2: HareFood, 3: HareHabitat, 4: FoxHabitat}
-
-        for (y, x), agent_type in np.ndenumerate(self.map):
-            agent_class = agent_mapping.get(agent_type)
-            if agent_class:
-                if agent_class != HareFood:
-                    params = self.fox_habitat_params if agent_class == FoxHabitat else self.hare_habitar_params
-                    agent = agent_class(self,**params)
-                else:
-                    agent = agent_class(self, self.hare_food_factory_params["food_lifetime"])
-                self.scheduler.add(agent)
-                self.grid.place_agent(agent, (x, self.height - 1 - y))
-                if agent_class == HareHabitat or agent_class == FoxHabitat:
-                    agent.create_animals()
+        plants = np.where(self.map == 2)
+        self.food.add(plants[1], self.height - 1 - plants[0], self.hare_food_factory_params["food_lifetime"])
+
+        agent_mapping = {3: (HareHabitat, self.hare_habitar_params), 4: (FoxHabitat, self.fox_habitat_params)}
+
+        # Only the habitat cells are visited, in the row-major order of the map.
+        ys, xs = np.nonzero(np.isin(self.map, list(agent_mapping)))
+        for y, x, agent_type in zip(ys.tolist(), xs.tolist(), self.map[ys, xs].tolist()):
+            agent_class, params = agent_mapping[agent_type]
+            agent = agent_class(self, **params)
+            self.scheduler.add(agent)
+            self.grid.place_agent(agent, (x, self.height - 1 - y))
+            agent.create_animals()
 
         HareFoodFactory(self,**self.hare_food_factory_params)
         VaccineFactory(self, **self.vaccine_factory_params)
         self.running = True
 
+    @property
+    def map(self) -> np.ndarray:
+        return self._map
+
+    @map.setter
+    def map(self, map: np.ndarray) -> None:
+        """
+        Sets the terrain map and recomputes the flat map indexes of its meadow (with plants) and forest cells.
+        """
+        self._map = map
+        self.meadow_cells = np.flatnonzero((map == 0) | (map == 2))
+        self.forest_cells = np.flatnonzero(map == 1)
+
+    def sample_cells(self, cells: np.ndarray, size: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Draws size random cells (with repetition) of the given flat map indexes and returns their grid positions xs, ys.
+        """
+        rows, columns = np.divmod(cells[rng.integers(0, len(cells), size)], self.map.shape[1])
+        return columns, self.height - 1 - rows
+
     def step(self):
+        step = self.scheduler.steps
         self.datacollector.collect(self)
-        self.datacollector.get_model_vars_dataframe().to_csv("data.csv")
+        if self.metrics:
+            model_vars = self.datacollector.model_vars
+            self.metrics.write(
+                len(model_vars["agent_count"]) - 1,
+                {name: values[-1] for name, values in model_vars.items()}
+            )
         self.scheduler.step()
+        if self.profiler:
+            self.profiler.end_step(step)
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._flush_metrics_on_teardown()
+
+    def _flush_metrics_on_teardown(self) -> None:
+        """
+        Flushes the buffered metrics rows when the model is garbage collected or the interpreter exits,
+        so models driven step by step (e.g. from the server) do not lose the rows of the last interval.
+        """
+        if self.metrics:
+            weakref.finalize(self, self.metrics.flush)
+
+    def close(self) -> None:
+        """
+        Writes the buffered metrics rows to the metrics file.
+        """
+        if self.metrics:
+            self.metrics.flush()
+
+    def save(self, path: str) -> None:
+        """
+        Saves the complete state of the model, see snapshot.save_snapshot.
+        """
+        save_snapshot(self, path)
+
+    @staticmethod
+    def load(path: str) -> 'SimulationModel':
+        """
+        Restores the model saved with save, see snapshot.load_snapshot.
+        """
+        return load_snapshot(path)
 
     def run_model(self):
-        for _ in range(self.iterations):
+        while self.scheduler.steps < self.iterations:
             self.step()
+            if self.snapshot_path and self.scheduler.steps % self.snapshot_interval == 0:
+                self.save(self.snapshot_path)
+        self.close()
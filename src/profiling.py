@@ -0,0 +1,79 @@
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import pandas as pd
+
+
+class TimedPhase:
+    """
+    Callable replacing a method on a single object, records every call of the method in the profiler.
+    """
+
+    def __init__(self, profiler: 'StepProfiler', name: str, method: Callable) -> None:
+        self.profiler = profiler
+        self.name = name
+        self.method = method
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return self.method(*args, **kwargs)
+        finally:
+            self.profiler.record(self.name, time.perf_counter() - start)
+
+
+class StepProfiler:
+    """
+    Records wall time and number of calls per agent class and per inner phase of the step.
+
+    Classes list the methods to measure in PROFILED_PHASES. They are wrapped per object when
+    the object is instrumented, so nothing is wrapped when the profiler is not used.
+    Phase times are inclusive, e.g. Hare.find_food contains its calls to Hare.listen.
+    """
+
+    def __init__(self) -> None:
+        self.rows: List[Tuple[int, str, int, float]] = []
+        self._current: Dict[str, List[float]] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        """
+        Adds one call which took the given time to the current step.
+        """
+        entry = self._current.get(name)
+        if entry is None:
+            entry = self._current[name] = [0, 0.0]
+        entry[0] += 1
+        entry[1] += seconds
+
+    def instrument(self, obj: Any) -> None:
+        """
+        Wraps the PROFILED_PHASES methods of the object.
+        """
+        name = type(obj).__name__
+        for phase in getattr(obj, "PROFILED_PHASES", ()):
+            setattr(obj, phase, TimedPhase(self, f"{name}.{phase}", getattr(obj, phase)))
+
+    def end_step(self, step: int) -> None:
+        """
+        Closes the records of the given step.
+        """
+        for name, (calls, seconds) in self._current.items():
+            self.rows.append((step, name, calls, seconds))
+        self._current = {}
+
+    def table(self) -> pd.DataFrame:
+        """
+        Returns the calls and time of every class and phase in every step.
+        """
+        return pd.DataFrame(self.rows, columns=["Step", "Name", "Calls", "Seconds"])
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Returns the calls and time of every class and phase over the whole run.
+        """
+        table = self.table()
+        summary = table.groupby("Name")[["Calls", "Seconds"]].sum()
+        summary["us_per_call"] = 1e6 * summary["Seconds"] / summary["Calls"]
+        summary["Seconds_per_step"] = summary["Seconds"] / max(1, table["Step"].nunique())
+
+        return summary.sort_values("Seconds", ascending=False)
@@ -0,0 +1,169 @@
+from collections import Counter
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+import time
+import mesa
+
+from .environment.space import class_of
+from .timers import TimerQueue
+
+
+class CountingScheduler(mesa.time.BaseScheduler):
+    """
+    BaseScheduler which keeps live number of scheduled agents of every class.
+    """
+
+    def __init__(self, model: mesa.Model) -> None:
+        super().__init__(model)
+        self.counts: Counter = Counter()
+
+    def add(self, agent: mesa.Agent) -> None:
+        super().add(agent)
+        self.counts[class_of(agent)] += 1
+
+    def remove(self, agent: mesa.Agent) -> None:
+        super().remove(agent)
+        self.counts[class_of(agent)] -= 1
+
+    def get_type_count(self, agent_type: type) -> int:
+        """
+        Returns the number of scheduled agents of the given class.
+        """
+        return self.counts[agent_type]
+
+
+class StagedScheduler(CountingScheduler):
+    """
+    Scheduler which steps agents in fixed stages grouped by class, then steps the environment fields.
+
+    Within a stage the classes are stepped in the listed order and agents of one class in the order
+    they were added; classes which are not listed are stepped after the last stage. batched may map
+    a class to a function step_all(model, agents) which updates all its agents in one pass instead of calling step on each.
+    prepare may map a class to a function prepare(model, agents) which is called before its agents are stepped.
+    At the turn of every class the due timers of its agents fire first; the classes listed as timed
+    act only through their timers and are kept in the scheduler without being stepped.
+
+    Agents added during a step are stepped from the next step on, agents removed during a step
+    are not stepped anymore. When the model has a profiler, agents are instrumented on add and the
+    step time of every class is recorded under its name.
+    """
+
+    def __init__(
+        self,
+        model: mesa.Model,
+        stages: Sequence[Tuple[type, ...]],
+        environment: Sequence[Any] = (),
+        batched: Dict[type, Callable[[mesa.Model, List[mesa.Agent]], None]] = None,
+        prepare: Dict[type, Callable[[mesa.Model, List[mesa.Agent]], None]] = None,
+        timers: TimerQueue = None,
+        timed: Sequence[type] = ()
+    ) -> None:
+        super().__init__(model)
+        self.stages = [tuple(stage) for stage in stages]
+        self.environment = list(environment)
+        self.batched = dict(batched or {})
+        self.prepare = dict(prepare or {})
+        self.timers = timers
+        self.timed = frozenset(timed)
+        self._buckets: Dict[type, Dict[int, mesa.Agent]] = {}
+        self._pending: List[mesa.Agent] = []
+        self._stepping = False
+
+    def add(self, agent: mesa.Agent) -> None:
+        super().add(agent)
+        if self.model.profiler:
+            self.model.profiler.instrument(agent)
+        if self._stepping:
+            self._pending.append(agent)
+        else:
+            self._buckets.setdefault(class_of(agent), {})[agent.unique_id] = agent
+
+    def remove(self, agent: mesa.Agent) -> None:
+        super().remove(agent)
+        bucket = self._buckets.get(class_of(agent))
+        if bucket:
+            bucket.pop(agent.unique_id, None)
+
+    @property
+    def first_step(self) -> int:
+        """
+        Returns the first step in which an agent added now is stepped.
+        """
+        return self.steps + 1 if self._stepping else self.steps
+
+    def get_stages(self) -> List[Tuple[type, ...]]:
+        """
+        Returns the stages with the classes which are not listed in any stage as the last one.
+        """
+        listed = {agent_class for stage in self.stages for agent_class in stage}
+        return self.stages + [tuple(agent_class for agent_class in self._buckets if agent_class not in listed)]
+
+    def step_class(self, agent_class: type) -> None:
+        """
+        Fires the due timers of the class, then steps all its agents which were scheduled before the step started.
+        """
+        if self.timers:
+            self.fire_timers(agent_class)
+        if agent_class in self.timed:
+            return
+
+        bucket = self._buckets.get(agent_class)
+        if not bucket:
+            return
+        agents = list(bucket.values())
+        profiler = self.model.profiler
+
+        prepare = self.prepare.get(agent_class)
+        if prepare:
+            prepare(self.model, agents)
+
+        step_all = self.batched.get(agent_class)
+        if step_all:
+            start = time.perf_counter()
+            step_all(self.model, agents)
+            if profiler:
+                profiler.record(agent_class.__name__, time.perf_counter() - start)
+        elif profiler:
+            for agent in agents:
+                if agent.unique_id in bucket:
+                    start = time.perf_counter()
+                    agent.step()
+                    profiler.record(agent_class.__name__, time.perf_counter() - start)
+        else:
+            for agent in agents:
+                if agent.unique_id in bucket:
+                    agent.step()
+
+    def fire_timers(self, agent_class: type) -> None:
+        """
+        Calls the timers of the class which are due in this step, skipping agents removed in the meantime.
+        """
+        profiler = self.model.profiler
+        timer = self.timers.pop(agent_class, self.steps)
+        while timer:
+            agent = timer.agent
+            if self._agents.get(agent.unique_id) is not agent:
+                pass
+            elif profiler:
+                start = time.perf_counter()
+                getattr(agent, timer.method_name)()
+                profiler.record(agent_class.__name__, time.perf_counter() - start)
+            else:
+                getattr(agent, timer.method_name)()
+            timer = self.timers.pop(agent_class, self.steps)
+
+    def step(self) -> None:
+        self._stepping = True
+        for stage in self.get_stages():
+            for agent_class in stage:
+                self.step_class(agent_class)
+        for field in self.environment:
+            field.step()
+        self._stepping = False
+
+        for agent in self._pending:
+            if self._agents.get(agent.unique_id) is agent:
+                self._buckets.setdefault(class_of(agent), {})[agent.unique_id] = agent
+        self._pending = []
+
+        self.steps += 1
+        self.time += 1
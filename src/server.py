@@ -3,9 +3,10 @@ import mesa
 from .agents.vaccine_factory import Vaccine
 from .agents import *
 from .model import SimulationModel
+from .environment.sound import SoundField
+from .environment.space import class_of
 from .agents.fox_habitat import FoxHabitat
 from .agents.hare_habitat import HareHabitat
-from .agents.hare_food import HareFood
 
 def fox_hare_portrayal(agent):
     if agent is None:
@@ -13,85 +14,35 @@ def fox_hare_portrayal(agent):
 
     portrayal = {}
 
-    if type(agent) is Hare:
+    if class_of(agent) is Hare:
         portrayal["Shape"] = 'src/resources/hare.png'
         portrayal["scale"] = 0.9
         portrayal["Layer"] = 2
         portrayal["w"] = 1
         portrayal["h"] = 1
 
-    elif type(agent) is Fox:
+    elif class_of(agent) is Fox:
         portrayal["Shape"] = 'src/resources/fox.png'
         portrayal["scale"] = 0.9
         portrayal["Layer"] = 2
         portrayal["w"] = 1
         portrayal["h"] = 1
 
-    elif type(agent) is Pheromone:
-        value = max(0, min(1, agent.value))
-        shades_of_yellow = [
-            "#FFFF99",  # Light Yellow
-            "#FFFF66",  # Pale Yellow
-            "#FFFF00",  # Lemon Yellow
-            "#FFD700",  # Canary Yellow / Gold Yellow
-            "#FFFF00",  # Yellow
-            "#FFD700",  # Gold Yellow / Canary Yellow
-            "#DAA520",  # Goldenrod
-            "#F4C430",  # Saffron Yellow
-            "#FFBF00",  # Amber Yellow
-            "#FFA500"   # Dark Yellow
-        ]
-        index = int(value * (len(shades_of_yellow) - 1))
-
-        portrayal["Color"] = [shades_of_yellow[index]]
-        portrayal["Shape"] = "rect"
-        portrayal["Filled"] = "true"
-        portrayal["Layer"] = 1
-        portrayal["w"] = 1
-        portrayal["h"] = 1
-
-    elif type(agent) is HareFood and not agent.eaten:
-        portrayal["Shape"] = "src/resources/plant.png"
-        portrayal["scale"] = 0.9
-        portrayal["Layer"] = 0
-        portrayal["w"] = 1
-        portrayal["h"] = 1
-
-    elif type(agent) is Sound:
-        shades_of_blue = [
-            "#0000FF",
-            "#0000CC",
-            "#000099",
-            "#336699",
-            "#3399FF",
-            "#66B2FF",
-            "#99CCFF",
-            "#CCE5FF",
-            "#66A3FF",
-            "#0066CC"
-        ]
-        portrayal["Color"] = [shades_of_blue[min(9, agent.r-1)]]
-        portrayal["Shape"] = "rect"
-        portrayal["Filled"] = "true"
-        portrayal["Layer"] = 0
-        portrayal["w"] = 1
-        portrayal["h"] = 1
-
-    elif type(agent) is HareHabitat:
+    elif class_of(agent) is HareHabitat:
         portrayal["Shape"] = "src/resources/rabbit_hole.png"
         portrayal["Filled"] = "true"
         portrayal["Layer"] = 0
         portrayal["w"] = 1
         portrayal["h"] = 1
 
-    elif type(agent) is FoxHabitat:
+    elif class_of(agent) is FoxHabitat:
         portrayal["Shape"] = "src/resources/fox_cave.png"
         portrayal["Filled"] = "true"
         portrayal["Layer"] = 0
         portrayal["w"] = 1
         portrayal["h"] = 1
     
-    elif type(agent) is Vaccine:
+    elif class_of(agent) is Vaccine:
         portrayal["Shape"] = "src/resources/vaccine.png"
         portrayal["Filled"] = "true"
         portrayal["Layer"] = 0
@@ -100,7 +51,99 @@ def fox_hare_portrayal(agent):
         
     return portrayal
 
-canvas_element = mesa.visualization.CanvasGrid(fox_hare_portrayal, 100, 100, 800, 800)
+def pheromone_portrayal(value):
+    value = max(0, min(1, value))
+    shades_of_yellow = [
+        "#FFFF99",  # Light Yellow
+        "#FFFF66",  # Pale Yellow
+        "#FFFF00",  # Lemon Yellow
+        "#FFD700",  # Canary Yellow / Gold Yellow
+        "#FFFF00",  # Yellow
+        "#FFD700",  # Gold Yellow / Canary Yellow
+        "#DAA520",  # Goldenrod
+        "#F4C430",  # Saffron Yellow
+        "#FFBF00",  # Amber Yellow
+        "#FFA500"   # Dark Yellow
+    ]
+    index = int(value * (len(shades_of_yellow) - 1))
+
+    portrayal = {}
+    portrayal["Color"] = [shades_of_yellow[index]]
+    portrayal["Shape"] = "rect"
+    portrayal["Filled"] = "true"
+    portrayal["Layer"] = 1
+    portrayal["w"] = 1
+    portrayal["h"] = 1
+
+    return portrayal
+
+
+def sound_portrayal(value):
+    shades_of_blue = [
+        "#0000FF",
+        "#0000CC",
+        "#000099",
+        "#336699",
+        "#3399FF",
+        "#66B2FF",
+        "#99CCFF",
+        "#CCE5FF",
+        "#66A3FF",
+        "#0066CC"
+    ]
+    r = max(1, round((SoundField.FORCE / value) ** 0.5))
+
+    portrayal = {}
+    portrayal["Color"] = [shades_of_blue[min(9, r-1)]]
+    portrayal["Shape"] = "rect"
+    portrayal["Filled"] = "true"
+    portrayal["Layer"] = 0
+    portrayal["w"] = 1
+    portrayal["h"] = 1
+
+    return portrayal
+
+
+def plant_portrayal():
+    portrayal = {}
+    portrayal["Shape"] = "src/resources/plant.png"
+    portrayal["scale"] = 0.9
+    portrayal["Layer"] = 0
+    portrayal["w"] = 1
+    portrayal["h"] = 1
+
+    return portrayal
+
+
+class FieldCanvasGrid(mesa.visualization.CanvasGrid):
+    """
+    Canvas grid which also draws the array-backed layers of the model.
+    """
+
+    def render(self, model):
+        grid_state = super().render(model)
+        for x, y in zip(*model.food.expiry.nonzero()):
+            portrayal = plant_portrayal()
+            portrayal["x"] = int(x)
+            portrayal["y"] = int(y)
+            grid_state[portrayal["Layer"]].append(portrayal)
+
+        for x, y in zip(*model.pheromones.values.nonzero()):
+            portrayal = pheromone_portrayal(model.pheromones[x, y])
+            portrayal["x"] = int(x)
+            portrayal["y"] = int(y)
+            grid_state[portrayal["Layer"]].append(portrayal)
+
+        for x, y in zip(*model.sounds.intensity.nonzero()):
+            portrayal = sound_portrayal(model.sounds[x, y])
+            portrayal["x"] = int(x)
+            portrayal["y"] = int(y)
+            grid_state[portrayal["Layer"]].append(portrayal)
+
+        return grid_state
+
+
+canvas_element = FieldCanvasGrid(fox_hare_portrayal, 100, 100, 800, 800)
 
 model_params = {
     "title": mesa.visualization.StaticText("Parameters:"),
@@ -0,0 +1,58 @@
+import pickle
+import struct
+import zlib
+from typing import Any, Dict
+
+import mesa
+
+MAGIC = b"WSSNAP"
+VERSION = 13
+
+
+class SnapshotError(Exception):
+    """
+    Raised when a snapshot cannot be restored.
+    """
+    pass
+
+
+def save_snapshot(model: mesa.Model, path: str) -> None:
+    """
+    Saves the complete state of the model to the file.
+
+    The snapshot holds the model with its grid, agents, scheduler, fields, terrain map and random
+    generators. It is stored as a compressed pickle behind a magic and a format version.
+    """
+    if model.metrics:
+        model.metrics.flush()
+
+    state: Dict[str, Any] = {
+        "model": model,
+    }
+    payload = zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL), 1)
+
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<H", VERSION))
+        f.write(payload)
+
+
+def load_snapshot(path: str) -> mesa.Model:
+    """
+    Restores the model saved by save_snapshot.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if data[:len(MAGIC)] != MAGIC:
+        raise SnapshotError(f"{path} is not a snapshot")
+    (version,) = struct.unpack_from("<H", data, len(MAGIC))
+    if version != VERSION:
+        raise SnapshotError(f"Snapshot version {version} is not supported, expected version {VERSION}")
+
+    try:
+        state = pickle.loads(zlib.decompress(data[len(MAGIC) + 2:]))
+    except Exception as e:
+        raise SnapshotError(f"Snapshot {path} cannot be restored: {e}") from e
+
+    return state["model"]
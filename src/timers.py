@@ -0,0 +1,49 @@
+from typing import Dict, List, NamedTuple, Union
+import heapq
+import mesa
+
+from .environment.space import class_of
+
+
+class Timer(NamedTuple):
+    """
+    Call of a method of an agent which is due in a tick.
+    """
+    tick: int
+    seq: int
+    agent: mesa.Agent
+    method_name: str
+
+
+class TimerQueue:
+    """
+    Timers of the agents which only act now and then, kept in one heap per agent class ordered by tick.
+
+    Such agents schedule their next action instead of being stepped in between. The scheduler fires
+    the due timers of a class at the place where the class would be stepped, timers of one tick fire
+    in the order they were scheduled. Timers hold the agent and the name of its method, so they pickle
+    with the model.
+    """
+
+    def __init__(self) -> None:
+        self._heaps: Dict[type, List[Timer]] = {}
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return sum(len(heap) for heap in self._heaps.values())
+
+    def schedule(self, tick: int, agent: mesa.Agent, method_name: str) -> None:
+        """
+        Schedules the call of the method of the agent in the given tick.
+        """
+        heapq.heappush(self._heaps.setdefault(class_of(agent), []), Timer(tick, self._seq, agent, method_name))
+        self._seq += 1
+
+    def pop(self, agent_class: type, tick: int) -> Union[Timer, None]:
+        """
+        Removes and returns the earliest timer of the class which is due in the tick, or None if there is none.
+        """
+        heap = self._heaps.get(agent_class)
+        if heap and heap[0].tick <= tick:
+            return heapq.heappop(heap)
+        return None
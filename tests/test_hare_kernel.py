@@ -0,0 +1,22 @@
+from src.agents.hare import Hare
+from src.agents.hare_kernel import KernelHare
+
+
+def test_kernel_binds_only_the_hares_of_its_model(make_model):
+    vectorized = make_model(vectorized_hares=True)
+    model = make_model()
+
+    assert all(type(hare) is KernelHare for hare in vectorized.grid.get_agents_of_type(Hare))
+    assert all(type(hare) is Hare for hare in model.grid.get_agents_of_type(Hare))
+    assert "pos" not in Hare.__dict__
+
+
+def test_kernel_hares_are_placed_before_they_take_a_slot(make_model):
+    model = make_model(vectorized_hares=True)
+    for _ in range(5):
+        model.step()
+
+    kernel = model.hare_kernel
+    hares = model.grid.get_agents_of_type(Hare)
+    assert model.scheduler.get_type_count(Hare) == len(hares) == len(kernel.hares) > 0
+    assert all(tuple(kernel.pos[hare._slot]) == hare.pos for hare in hares)
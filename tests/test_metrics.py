@@ -0,0 +1,16 @@
+import gc
+
+import pandas as pd
+
+
+def test_rows_of_stepped_model_are_flushed_on_teardown(make_model, tmp_path):
+    path = tmp_path / "metrics.csv"
+    model = make_model(metrics_path=str(path))
+    for _ in range(5):
+        model.step()
+    assert not path.exists()
+
+    del model
+    gc.collect()
+
+    assert len(pd.read_csv(path, index_col=0)) == 5
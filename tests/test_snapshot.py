@@ -0,0 +1,33 @@
+import struct
+
+import pytest
+
+from src.snapshot import MAGIC, VERSION, SnapshotError, load_snapshot, save_snapshot
+
+
+def test_snapshot_of_previous_version_is_rejected(make_model, tmp_path):
+    path = tmp_path / "model.snapshot"
+    model = make_model()
+    model.step()
+    save_snapshot(model, str(path))
+
+    data = bytearray(path.read_bytes())
+    struct.pack_into("<H", data, len(MAGIC), VERSION - 1)
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(SnapshotError):
+        load_snapshot(str(path))
+
+
+def test_restored_model_keeps_stepping_its_fields(make_model, tmp_path):
+    path = tmp_path / "model.snapshot"
+    model = make_model()
+    for _ in range(5):
+        model.step()
+    save_snapshot(model, str(path))
+
+    restored = load_snapshot(str(path))
+    for _ in range(5):
+        restored.step()
+
+    assert restored.food.tick == model.food.tick + 5
@@ -0,0 +1,42 @@
+import pytest
+
+from src.agents.fox import Fox, State
+from src.agents.fox_habitat import FoxHabitat
+from src.agents.hare import Hare
+
+
+@pytest.fixture
+def model(make_model):
+    return make_model()
+
+
+@pytest.mark.parametrize("state, force", [(State.SNEAKING, 1), (State.WALKING, 10), (State.SPRINTING, 20)])
+def test_hare_next_to_fox_hears_its_force(model, state, force):
+    home = model.grid.get_agents_of_type(FoxHabitat)[0]
+    fox = Fox(model, home, True, **model.fox_params)
+    model.grid.place_agent(fox, (25, 25))
+    hare = Hare(model, **model.hare_params)
+    model.grid.place_agent(hare, (26, 25))
+
+    fox.state = state
+    fox.make_noise()
+    model.sounds.step()
+
+    assert hare.listen().values.max() == force
+
+
+def test_noise_fades_after_a_tick(model):
+    model.sounds.emit((25, 25), 20)
+    model.sounds.step()
+    model.sounds.step()
+
+    assert model.sounds[(27, 25)] == 10 / 2 ** 2
+    assert model.sounds[(26, 25)] == 0
+
+
+def test_noise_of_fox_stage_is_heard_next_step(model):
+    # Noise made in the fox stage must still be the radius 1 ring when hares listen in the next step.
+    model.scheduler.prepare[Fox] = lambda model, foxes: model.sounds.emit((0, 0), 20)
+    model.step()
+
+    assert model.sounds[(1, 1)] == 20